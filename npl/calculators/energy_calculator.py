@@ -2,13 +2,46 @@ from ase.optimize import BFGS
 from ase.calculators.emt import EMT
 
 import numpy as np
-import copy
-import pickle
+import scipy.sparse as sp
+from scipy.spatial.distance import cdist
+from collections import OrderedDict
+import hashlib
+import joblib
 import sklearn.gaussian_process as gp
 from sklearn.linear_model import BayesianRidge
 from sklearn.metrics import mean_absolute_error, root_mean_squared_error
 
 
+_training_data_cache = dict()
+
+
+def get_training_data(training_set, feature_key, energy_key):
+    """Stack the feature vectors and energies of a training set into dense arrays.
+
+    The result is memoized on the identity of the training set, so repeated refits
+    (e.g. hyperparameter scans) reuse the same arrays instead of rebuilding them.
+
+    Parameters:
+        training_set : list of Nanoparticles
+        feature_key : str
+        energy_key : str
+    """
+    cache_key = (id(training_set), feature_key, energy_key, len(training_set))
+    if cache_key in _training_data_cache:
+        return _training_data_cache[cache_key]
+
+    n_particles = len(training_set)
+    n_features = len(training_set[0].get_feature_vector(feature_key))
+    feature_vectors = np.empty((n_particles, n_features), dtype=np.float64)
+    energies = np.empty(n_particles, dtype=np.float64)
+    for i, particle in enumerate(training_set):
+        feature_vectors[i] = particle.get_feature_vector(feature_key)
+        energies[i] = particle.get_energy(energy_key)
+
+    _training_data_cache[cache_key] = (feature_vectors, energies)
+    return feature_vectors, energies
+
+
 class EnergyCalculator:
     """Base class for an energy calculator.
 
@@ -23,19 +56,30 @@ class EnergyCalculator:
         raise NotImplementedError
 
     def get_energy_key(self):
-        return copy.deepcopy(self.energy_key)
+        return self.energy_key
 
     def set_energy_key(self, energy_key):
         self.energy_key = energy_key
 
+    @staticmethod
+    def structure_hash(atoms):
+        """Return a digest identifying the geometry and ordering of an atoms object.
+
+        Note that float-perturbed positions hash differently, so memoization on this
+        key is only safe for workflows that revisit identical structures.
+        """
+        return hashlib.blake2b(atoms.positions.tobytes() +
+                               ''.join(atoms.get_chemical_symbols()).encode()).digest()
+
     def save(self, name_file : str):
-        with open(name_file, 'wb') as out:
-            pickle.dump(self, out)
+        # joblib serializes the numpy arrays (training data, kernels, coefficients)
+        # natively, giving smaller files and faster reads than plain pickle
+        joblib.dump(self, name_file, compress=3)
 
     @staticmethod
     def load(name_file):
-        with open(name_file, 'rb') as calc:
-            return pickle.load(calc)
+        # joblib transparently reads calculators saved with the old pickle format
+        return joblib.load(name_file)
 
 
 class EMTCalculator(EnergyCalculator):
@@ -79,12 +123,15 @@ class EMTCalculator(EnergyCalculator):
             >>> print(f"Computed energy: {energy}")
     """
 
-    def __init__(self, fmax=0.01, steps=50, relax_atoms=False):
+    def __init__(self, fmax=0.01, steps=50, relax_atoms=False, cache_energies=False):
         EnergyCalculator.__init__(self)
         self.fmax = fmax
         self.steps = steps
         self.energy_key = 'EMT'
         self.relax_atoms = relax_atoms
+        self.cache_energies = cache_energies
+        self._emt = EMT()
+        self._energy_cache = dict()
 
     def compute_energy(self, particle):
         """Compute the energy using EMT.
@@ -98,21 +145,73 @@ class EMTCalculator(EnergyCalculator):
         """
 
         atoms = particle.get_ase_atoms(exclude_x=True)
-        if not self.relax_atoms:
-            atoms = atoms.copy()
 
-        atoms.set_calculator(EMT())
-        dyn = BFGS(atoms, logfile=None)
-        dyn.run(fmax=self.fmax, steps=self.steps)
+        if self.cache_energies:
+            cache_key = self.structure_hash(atoms)
+            if cache_key in self._energy_cache:
+                particle.set_energy(self.energy_key, self._energy_cache[cache_key])
+                return
+
+        atoms.set_calculator(self._emt)
+
+        if self.relax_atoms:
+            dyn = BFGS(atoms, logfile=None)
+            dyn.run(fmax=self.fmax, steps=self.steps)
 
         energy = atoms.get_potential_energy()
+        if self.cache_energies:
+            self._energy_cache[cache_key] = energy
         particle.set_energy(self.energy_key, energy)
 
 
+class CachedEnergyCalculator(EnergyCalculator):
+    """Memoizing wrapper around a feature-vector based energy calculator.
+
+    For descriptor-driven models the energy is a pure function of the feature
+    vector, so the wrapper keys computed energies on a digest of the feature
+    vector bytes and replays them without touching the underlying model. The
+    cache is LRU-bounded; entries only leave by eviction. Optimization runs
+    that revisit neighborhoods of the current minimum hit the cache often.
+    """
+
+    def __init__(self, energy_calculator, feature_key=None, maxsize=65536):
+        EnergyCalculator.__init__(self)
+        self.energy_calculator = energy_calculator
+        self.energy_key = energy_calculator.get_energy_key()
+        self.feature_key = feature_key if feature_key is not None \
+            else energy_calculator.feature_key
+        self.maxsize = maxsize
+        self._energy_cache = OrderedDict()
+
+    def compute_energy(self, particle):
+        """Set the cached energy for the particle's current feature vector.
+
+        Falls through to the wrapped calculator on a miss.
+
+        Parameters:
+            particle : Nanoparticle
+        """
+        cache_key = hashlib.blake2b(
+            particle.get_feature_vector(self.feature_key).tobytes(),
+            digest_size=16).digest()
+        cache = self._energy_cache
+        energy = cache.get(cache_key)
+        if energy is not None:
+            cache.move_to_end(cache_key)
+            particle.set_energy(self.energy_key, energy)
+            return
+
+        self.energy_calculator.compute_energy(particle)
+        cache[cache_key] = particle.get_energy(self.energy_key)
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+
+
 class GPRCalculator(EnergyCalculator):
     """Energy calculator using global feature vectors and Gaussian Process Regression."""
 
-    def __init__(self, feature_key, kernel=None, alpha=0.01, normalize_y=True):
+    def __init__(self, feature_key, kernel=None, alpha=0.01, normalize_y=True,
+                 cache_energies=False, sparse=False, n_anchors=500):
         EnergyCalculator.__init__(self)
         if kernel is None:
             self.kernel = gp.kernels.ConstantKernel(1., (1e-1, 1e3)) * \
@@ -125,6 +224,15 @@ class GPRCalculator(EnergyCalculator):
         self.GPR = None
         self.energy_key = 'GPR'
         self.feature_key = feature_key
+        self.cache_energies = cache_energies
+        self._energy_cache = dict()
+
+        self.sparse = sparse
+        self.n_anchors = n_anchors
+        self._anchors = None
+        self._sparse_weights = None
+        self._y_mean = 0.0
+        self._prediction_cache = None
 
     def fit(self, training_set, energy_key):
         """Fit the GPR model.
@@ -136,14 +244,67 @@ class GPRCalculator(EnergyCalculator):
             training_set : list of Nanoparticles
             energy_key : str
         """
-        feature_vectors = [p.get_feature_vector(self.feature_key) for p in training_set]
-        energies = [p.get_energy(energy_key) for p in training_set]
+        feature_vectors, energies = get_training_data(training_set, self.feature_key,
+                                                      energy_key)
+
+        if self.sparse:
+            self._fit_sparse(feature_vectors, energies)
+            return
 
         self.GPR = gp.GaussianProcessRegressor(kernel=self.kernel,
                                                n_restarts_optimizer=20,
                                                alpha=self.alpha,
                                                normalize_y=self.normalize_y)
         self.GPR.fit(feature_vectors, energies)
+        self._refresh_prediction_cache()
+
+    def _refresh_prediction_cache(self):
+        """Extract the trained GP state needed for GEMM-based batch prediction.
+
+        Only the default ConstantKernel * RBF form is supported; for any other
+        kernel the cache stays empty and batch prediction falls back to
+        GPR.predict.
+        """
+        self._prediction_cache = None
+        params = self.GPR.kernel_.get_params()
+        if 'k1__constant_value' not in params or 'k2__length_scale' not in params:
+            return
+        length_scale = np.atleast_1d(params['k2__length_scale'])
+        if length_scale.size != 1:
+            return
+
+        train_features = self.GPR.X_train_
+        self._prediction_cache = {
+            'train_features': train_features,
+            'train_sq_norms': np.square(train_features).sum(axis=1),
+            'scale': params['k1__constant_value'],
+            'length_scale_sq': float(length_scale[0])**2,
+            'alpha': np.ravel(self.GPR.alpha_),
+            'y_mean': self.GPR._y_train_mean,
+            'y_std': self.GPR._y_train_std,
+        }
+
+    def _fit_sparse(self, feature_vectors, energies):
+        """Nystroem approximation of the kernel regression fit.
+
+        A random subset of n_anchors training points spans the approximate kernel
+        space, trading the O(N^3) exact solve for O(N s^2). Kernel hyperparameters
+        are used as given, no marginal-likelihood optimization is performed.
+        """
+        n_samples = len(feature_vectors)
+        n_anchors = min(self.n_anchors, n_samples)
+        anchor_indices = np.random.choice(n_samples, n_anchors, replace=False)
+        self._anchors = np.ascontiguousarray(feature_vectors[anchor_indices])
+
+        if self.normalize_y:
+            self._y_mean = float(np.mean(energies))
+        targets = energies - self._y_mean
+
+        cross_kernel = self.kernel(feature_vectors, self._anchors)
+        anchor_kernel = self.kernel(self._anchors)
+        system = cross_kernel.T @ cross_kernel + self.alpha * anchor_kernel
+        system.flat[::n_anchors + 1] += 1e-10
+        self._sparse_weights = np.linalg.solve(system, cross_kernel.T @ targets)
 
     def compute_energy(self, particle):
         """Compute the energy using GPR.
@@ -153,9 +314,52 @@ class GPRCalculator(EnergyCalculator):
         Parameters:
             particle : Nanoparticle
         """
-        energy = self.GPR.predict([particle.get_feature_vector(self.feature_key)])[0]
+        feature_vector = particle.get_feature_vector(self.feature_key)
+
+        if self.cache_energies:
+            cache_key = np.asarray(feature_vector).tobytes()
+            if cache_key in self._energy_cache:
+                particle.set_energy(self.energy_key, self._energy_cache[cache_key])
+                return
+
+        if self.sparse:
+            anchor_kernel_row = self.kernel(np.atleast_2d(feature_vector), self._anchors)
+            energy = float(anchor_kernel_row @ self._sparse_weights) + self._y_mean
+        else:
+            energy = self.GPR.predict([feature_vector])[0]
+        if self.cache_energies:
+            self._energy_cache[cache_key] = energy
         particle.set_energy(self.energy_key, energy)
 
+    def compute_energies(self, particles):
+        """Compute the energies of several particles with a single batched prediction.
+
+        Stacking the feature vectors into one (N, d) array amortizes the sklearn
+        per-call overhead over the whole batch.
+
+        Parameters:
+            particles : list of Nanoparticles
+        """
+        feature_vectors = np.asarray([p.get_feature_vector(self.feature_key)
+                                      for p in particles])
+        if self.sparse:
+            energies = self.kernel(feature_vectors, self._anchors) @ self._sparse_weights \
+                       + self._y_mean
+        elif self._prediction_cache is not None:
+            # one GEMM + exp over the whole query block instead of per-call kernel dispatch
+            cache = self._prediction_cache
+            sq_distances = -2.0 * feature_vectors @ cache['train_features'].T
+            sq_distances += np.square(feature_vectors).sum(axis=1)[:, None]
+            sq_distances += cache['train_sq_norms']
+            gram = np.exp(sq_distances / (-2.0 * cache['length_scale_sq']))
+            gram *= cache['scale']
+            energies = gram @ cache['alpha'] * cache['y_std'] + cache['y_mean']
+        else:
+            energies = self.GPR.predict(feature_vectors)
+        for particle, energy in zip(particles, energies):
+            particle.set_energy(self.energy_key, energy)
+        return energies
+
 
 class MixingEnergyCalculator(EnergyCalculator):
     """Compute the mixing energy using an arbitrary energy model.
@@ -175,6 +379,15 @@ class MixingEnergyCalculator(EnergyCalculator):
         self.recompute_energies = recompute_energies
         self.energy_key = 'Mixing Energy'
 
+        self._symbol_order = ()
+        self._reference_energies = np.empty(0)
+        self._refresh_mixing_parameters()
+
+    def _refresh_mixing_parameters(self):
+        self._symbol_order = tuple(self.mixing_parameters)
+        self._reference_energies = np.array([self.mixing_parameters[symbol]
+                                             for symbol in self._symbol_order])
+
     def compute_mixing_parameters(self, particle, symbols):
         """Compute the energies for the pure particles of the given symbols as reference points.
 
@@ -186,6 +399,7 @@ class MixingEnergyCalculator(EnergyCalculator):
             particle.random_ordering({symbol: 1.0})
             self.base_calculator.compute_energy(particle)
             self.mixing_parameters[symbol] = particle.get_energy('EMT')
+        self._refresh_mixing_parameters()
 
     def compute_energy(self, particle):
         """Compute the mixing energy of the particle using the base energy model.
@@ -204,9 +418,10 @@ class MixingEnergyCalculator(EnergyCalculator):
 
         n_atoms = particle.atoms.get_n_atoms()
 
-        for symbol in particle.get_stoichiometry():
-            mixing_energy -= self.mixing_parameters[symbol] * \
-                                particle.get_stoichiometry()[symbol] / n_atoms
+        stoichiometry = particle.get_stoichiometry()
+        counts = np.array([stoichiometry[symbol] for symbol in self._symbol_order],
+                          dtype=np.float64)
+        mixing_energy -= float(self._reference_energies @ counts) / n_atoms
 
         particle.set_energy(self.energy_key, mixing_energy)
 
@@ -251,12 +466,18 @@ class BayesianRRCalculator(EnergyCalculator):
     >>> energy = calculator.compute_energy(some_nanoparticle)
     """
 
-    def __init__(self, feature_key):
+    def __init__(self, feature_key, precision='fp64'):
         EnergyCalculator.__init__(self)
 
+        if precision not in ('fp32', 'fp64'):
+            raise ValueError("precision has to be 'fp32' or 'fp64'")
+
         self.ridge = BayesianRidge(fit_intercept=False)
         self.energy_key = 'BRR'
         self.feature_key = feature_key
+        self.precision = precision
+        self._dtype = np.float32 if precision == 'fp32' else np.float64
+        self._coefficients = None
 
     def fit(self, training_set, energy_key, validation_set=None):
         """Fit the Bayesian Ridge Regression (BRR) model.
@@ -280,14 +501,46 @@ class BayesianRRCalculator(EnergyCalculator):
             validation_set = training_set[split_index:]
             training_set = training_set[:split_index]
 
-        feature_vectors = [p.get_feature_vector(self.feature_key) for p in training_set]
-        energies = [p.get_energy(energy_key) for p in training_set]
+        feature_vectors, energies = get_training_data(training_set, self.feature_key,
+                                                      energy_key)
 
         self.ridge.fit(feature_vectors, energies)
+        self._refresh_coefficients()
 
         if validation_set:
             self.validate(validation_set, energy_key)
 
+    def fit_fast(self, training_set, energy_key, alpha=None):
+        """Fit only the MAP coefficients with a single closed-form ridge solve.
+
+        BayesianRidge iterates an EM loop to estimate the noise and weight precisions,
+        but compute_energy only ever consumes coef_. This path solves the equivalent
+        regularized normal equations with one Cholesky factorization instead. If alpha
+        is not given, a short BayesianRidge run estimates the regularization strength
+        first.
+
+        Parameters:
+        ----------
+        training_set : list of Nanoparticles
+            The dataset used for training the model.
+        energy_key : str
+            The key used to extract energy values from the nanoparticles.
+        alpha : float, optional
+            Ridge regularization strength. Estimated from the data if None.
+        """
+        feature_vectors, energies = get_training_data(training_set, self.feature_key,
+                                                      energy_key)
+
+        if alpha is None:
+            probe = BayesianRidge(fit_intercept=False, max_iter=5)
+            probe.fit(feature_vectors, energies)
+            alpha = probe.lambda_ / probe.alpha_
+
+        gram = feature_vectors.T @ feature_vectors
+        gram.flat[::gram.shape[0] + 1] += alpha
+        self.ridge.coef_ = np.linalg.solve(gram, feature_vectors.T @ energies)
+        self._refresh_coefficients()
+
     def validate(self, validation_set, energy_key):
         """Validate the Bayesian Ridge Regression (BRR) model.
 
@@ -302,18 +555,23 @@ class BayesianRRCalculator(EnergyCalculator):
         -------
         None
         """
-        pred_validation = [self.compute_energy(p) for p in validation_set]
         true_validation = [p.get_energy(energy_key) for p in validation_set]
+        pred_validation = self.compute_energies(validation_set)
         mae = mean_absolute_error(true_validation, pred_validation)
         rmse = root_mean_squared_error(true_validation, pred_validation)
         print('Mean Absolute error {:.4f} meV/atom'.format(mae))
         print('Root Mean Square error {:.4f} meV/atom'.format(rmse))
 
+    def _refresh_coefficients(self):
+        # the fit itself always runs at fp64; only the cached inference copy is downcast
+        self._coefficients = np.ascontiguousarray(self.ridge.coef_, dtype=self._dtype)
+
     def get_coefficients(self):
         return self.ridge.coef_
 
     def set_coefficients(self, new_coefficients):
         self.ridge.coef_ = new_coefficients
+        self._refresh_coefficients()
 
     def set_feature_key(self, feature_key):
         self.feature_key = feature_key
@@ -326,14 +584,55 @@ class BayesianRRCalculator(EnergyCalculator):
         Parameters:
             particle : Nanoparticle
         """
-        feature_vector = particle.get_feature_vector(self.feature_key)
-        # brr_energy = self.ridge.predict([particle.get_feature_vector(self.feature_key)])
-        # brr_energy = np.dot(np.transpose(self.ridge.coef_),
-        # particle.get_feature_vector(self.feature_key))
-        brr_energy = np.dot(np.transpose(self.ridge.coef_), feature_vector)
+        feature_vector = np.asarray(particle.get_feature_vector(self.feature_key),
+                                    dtype=self._dtype)
+        brr_energy = float(self._coefficients @ feature_vector)
         particle.set_energy(self.energy_key, brr_energy)
         return brr_energy
 
+    def compute_energy_delta(self, particle, change):
+        """Update the stored energy from the feature-vector change of a local move.
+
+        The ridge model is linear in the feature vector, so the energy change of
+        an exchange is one dot product of the cached inference coefficients with
+        the change returned by update_feature_vector. The updated energy is
+        stored on the particle and the delta is returned.
+        """
+        delta_e = float(self._coefficients @ np.asarray(change, dtype=self._dtype))
+        particle.set_energy(self.energy_key, particle.get_energy(self.energy_key) + delta_e)
+        return delta_e
+
+    def compute_energies(self, particles):
+        """Compute the energies of several particles with a single batched prediction.
+
+        One matrix-vector product over the stacked (N, d) feature matrix replaces N
+        separate dot products.
+
+        Parameters:
+            particles : list of Nanoparticles
+        """
+        feature_vectors = np.asarray([p.get_feature_vector(self.feature_key)
+                                      for p in particles], dtype=self._dtype)
+        energies = feature_vectors @ self._coefficients
+        for particle, energy in zip(particles, energies):
+            particle.set_energy(self.energy_key, energy)
+        return energies
+
+
+try:
+    from numba import njit, prange
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _lateral_interaction_sum(interaction_matrix, indices):
+        total = 0.0
+        n_indices = indices.shape[0]
+        for i in prange(n_indices):
+            for j in range(i + 1, n_indices):
+                total += interaction_matrix[indices[i], indices[j]]
+        return total
+except ImportError:
+    _lateral_interaction_sum = None
+
 
 class DipoleMomentCalculator:
 
@@ -346,18 +645,27 @@ class DipoleMomentCalculator:
 
         symbols = particle.get_all_symbols()
         fake_charges = {symbols[0] : charges[0], symbols[1] : charges[1]}
-        partial_charges = [fake_charges[symbol] for symbol in particle.get_symbols()]
+        partial_charges = np.asarray([fake_charges[symbol] for symbol in particle.get_symbols()],
+                                     dtype=np.float64)
+        positions = np.asarray(particle.atoms.get_positions())
 
-        dipole_moments = []
-        environments = []
-        for central_atom_idx in particle.get_atom_indices_from_coordination_number([12]):
-            particle.translate_atoms_positions(particle.get_position(central_atom_idx))
-            dipole_moment = 0
-            for atom_idx in particle.get_coordination_atoms(central_atom_idx):
-                dipole_moment += partial_charges[atom_idx] * particle.get_position(atom_idx)
+        central_atom_indices = particle.get_atom_indices_from_coordination_number([12])
+        environments = [particle.get_coordination_atoms(central_atom_idx)
+                        for central_atom_idx in central_atom_indices]
 
-            dipole_moments.append(np.linalg.norm(dipole_moment))
-            environments.append(particle.get_coordination_atoms(central_atom_idx))
+        dipole_moments = []
+        if environments:
+            # flatten the neighborhoods CSR-style and reduce all centers in one pass
+            lengths = np.array([len(neighbors) for neighbors in environments])
+            neighbor_indices = np.concatenate(environments)
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+            # positions relative to the central atoms replace the in-place translation
+            relative_positions = (positions[neighbor_indices] -
+                                  np.repeat(positions[central_atom_indices], lengths, axis=0))
+            contributions = partial_charges[neighbor_indices, None] * relative_positions
+            dipole_vectors = np.add.reduceat(contributions, offsets, axis=0)
+            dipole_moments = list(np.linalg.norm(dipole_vectors, axis=1))
 
         self.total_dipole_moment = np.average(dipole_moments)/particle.get_n_atoms()
         self.dipole_moments = dipole_moments
@@ -378,6 +686,9 @@ class LateralInteractionCalculator:
     def __init__(self):
         EnergyCalculator.__init__(self)
         self.interaction_matrix = None
+        self.interaction_matrix_triu = None
+        self.occupation = None
+        self.energy = 0.0
         self.energy_key = 'Lateral Interaction'
         self.a = 6
 
@@ -394,111 +705,156 @@ class LateralInteractionCalculator:
             return particle
 
         def get_adsorbate_distance_matrix(particle, n_atoms_np):
-            ase_atoms = particle.get_ase_atoms()
-            adsorbate_all_distances = ase_atoms.get_all_distances()[n_atoms_np:]
-            distance_matrix = np.array([row[n_atoms_np:] for row in adsorbate_all_distances])
-            return distance_matrix
+            # only the adsorbate-adsorbate block is needed, so compute the M x M
+            # distances directly instead of the full (N+M)^2 matrix
+            adsorbate_positions = particle.atoms.get_positions()[n_atoms_np:]
+            return cdist(adsorbate_positions, adsorbate_positions)
 
         n_atoms_np = particle.get_n_atoms()
         particle = construct_adsorbate_grid(particle)
         distance_matrix = get_adsorbate_distance_matrix(particle, n_atoms_np)
-        interaction_matrix = np.zeros(distance_matrix.shape)
-        interaction_matrix = self.a / distance_matrix**2
 
-        dimension = len(interaction_matrix)
-        for i in np.arange(dimension):
-            interaction_matrix[i][i] = 0
+        # fused in-place a/r^2 with an O(n) diagonal reset instead of a Python loop
+        interaction_matrix = np.square(distance_matrix)
+        np.reciprocal(interaction_matrix, out=interaction_matrix)
+        interaction_matrix *= self.a
+        np.fill_diagonal(interaction_matrix, 0.0)
+
+        self.interaction_matrix = np.ascontiguousarray(interaction_matrix, dtype=np.float64)
 
-        self.interaction_matrix = interaction_matrix
+        # upper triangular sparse copy for incremental Monte Carlo updates
+        self.interaction_matrix_triu = sp.csr_matrix(np.triu(self.interaction_matrix, 1))
+        self.occupation = np.zeros(self.interaction_matrix.shape[0], dtype=np.float64)
+        self.energy = 0.0
+
+    def bind_occupation(self, particle):
+        """Synchronize the cached occupation vector with the particle and recompute the
+        total lateral interaction energy once.
+
+        Afterwards single site updates can be applied with update_site() at O(n) cost
+        instead of recomputing the full pairwise sum.
+
+        Parameters:
+            particle : Nanoparticle
+        """
+        self.occupation = np.asarray(particle.get_occupation_vector(), dtype=np.float64)
+        self.energy = float(self.occupation @ (self.interaction_matrix_triu @ self.occupation))
+        return self.energy
+
+    def delta_energy(self, site_index, new_status):
+        """Return the energy change if the occupation of one site is set to new_status.
+
+        Parameters:
+            site_index : int
+            new_status : int
+            Occupied (1) or unoccupied (0).
+        """
+        row_sum = (self.interaction_matrix_triu[site_index] @ self.occupation +
+                   self.interaction_matrix_triu[:, site_index].T @ self.occupation)
+        return (new_status - self.occupation[site_index]) * float(row_sum)
+
+    def update_site(self, site_index, new_status):
+        """Apply a single site occupation change and update the cached energy.
+
+        Parameters:
+            site_index : int
+            new_status : int
+        """
+        self.energy += self.delta_energy(site_index, new_status)
+        self.occupation[site_index] = new_status
+        return self.energy
 
     def bind_grid(self, particle):
-        particle_for_grid = copy.deepcopy(particle)
+        from npl.core.base_nanoparticle import BaseNanoparticle
+
+        # the grid construction only mutates atoms and the adsorption list, so a shallow
+        # structural clone is enough; the neighbor list is read-only here and can be shared
+        particle_for_grid = BaseNanoparticle()
+        particle_for_grid.atoms.add_atoms(particle.get_ase_atoms(exclude_x=False).copy())
+        particle_for_grid.neighbor_list = particle.neighbor_list
+        # mark the shared list as current, otherwise the first NL-dependent
+        # call on the clone rebuilds it in place and clobbers the source's
+        particle_for_grid._nl_valid = True
         self.construct_interatomic_potential_matrix(particle_for_grid)
 
     def compute_energy(self, particle):
-        lateral_interaction = 0
-        occupied_sites_indices = particle.get_occupation_status_by_indices(1)
-        for idx, site_index in enumerate(occupied_sites_indices):
-            for pair_index in occupied_sites_indices[idx:]:
-                lateral_interaction += self.interaction_matrix[site_index][pair_index]
+        occupied_sites_indices = np.asarray(particle.get_occupation_status_by_indices(1),
+                                            dtype=np.intp)
+        if _lateral_interaction_sum is not None:
+            # compiled pairwise loop avoids materializing the k x k submatrix
+            lateral_interaction = float(_lateral_interaction_sum(self.interaction_matrix,
+                                                                 occupied_sites_indices))
+        else:
+            # the diagonal is zero, so summing the occupied submatrix counts each pair twice
+            sub_matrix = self.interaction_matrix[np.ix_(occupied_sites_indices,
+                                                        occupied_sites_indices)]
+            lateral_interaction = 0.5 * float(sub_matrix.sum())
         particle.set_energy(self.energy_key, lateral_interaction)
 
 # TODO move to relevant file -> Basin Hopping, Local optimization
 # TODO remove scaling factors from topological descriptors
 
 
+# (cn, n_symbol_a_atoms) pairs for cn = 0..12 in the order the old nested loops produced
+_coordination_pairs = np.array([(cn, n_a) for cn in range(13) for n_a in range(cn + 1)])
+
+
 def compute_coefficients_for_linear_topological_model(global_topological_coefficients, symbols,
                                                       n_atoms):
-    coordination_numbers = list(range(13))
-    symbols_copy = copy.deepcopy(symbols)
-    symbols_copy.sort()
+    symbols_copy = sorted(symbols)
     symbol_a = symbols_copy[0]
     print("Coef symbol_a: {}".format(symbol_a))
 
+    global_topological_coefficients = np.asarray(global_topological_coefficients)
     e_aa_bond = global_topological_coefficients[0]/n_atoms
     e_bb_bond = global_topological_coefficients[1]/n_atoms
     e_ab_bond = global_topological_coefficients[2]/n_atoms
 
-    coefficients = []
-    total_energies = []
-    for symbol in symbols_copy:
-        for cn_number in coordination_numbers:
-            for n_symbol_a_atoms in range(cn_number + 1):
-                energy = 0
-
-                if symbol == symbol_a:
-                    energy += (global_topological_coefficients[3]*0.1)  # careful...
-                    energy += (n_symbol_a_atoms*e_aa_bond/2)
-                    energy += ((cn_number - n_symbol_a_atoms)*e_ab_bond/2)
-                    energy += (global_topological_coefficients[4 + cn_number])
+    cn_numbers = _coordination_pairs[:, 0]
+    n_symbol_a_atoms = _coordination_pairs[:, 1]
 
-                    total_energy = energy
-                    total_energy += n_symbol_a_atoms*e_aa_bond/2
-                    total_energy += (cn_number - n_symbol_a_atoms)*e_ab_bond/2
-                else:
-                    energy += (n_symbol_a_atoms*e_ab_bond/2)
-                    energy += ((cn_number - n_symbol_a_atoms)*e_bb_bond/2)
+    coefficient_blocks = []
+    total_energy_blocks = []
+    for symbol in symbols_copy:
+        if symbol == symbol_a:
+            energy = (global_topological_coefficients[3]*0.1  # careful...
+                      + n_symbol_a_atoms*e_aa_bond/2
+                      + (cn_numbers - n_symbol_a_atoms)*e_ab_bond/2
+                      + global_topological_coefficients[4 + cn_numbers])
+
+            total_energy = (energy
+                            + n_symbol_a_atoms*e_aa_bond/2
+                            + (cn_numbers - n_symbol_a_atoms)*e_ab_bond/2)
+        else:
+            energy = (n_symbol_a_atoms*e_ab_bond/2
+                      + (cn_numbers - n_symbol_a_atoms)*e_bb_bond/2)
 
-                    total_energy = energy
-                    total_energy += n_symbol_a_atoms*e_ab_bond/2
-                    total_energy += (cn_number - n_symbol_a_atoms)*e_bb_bond/2
+            total_energy = (energy
+                            + n_symbol_a_atoms*e_ab_bond/2
+                            + (cn_numbers - n_symbol_a_atoms)*e_bb_bond/2)
 
-                coefficients.append(energy)
-                total_energies.append(total_energy)
+        coefficient_blocks.append(energy)
+        total_energy_blocks.append(total_energy)
 
-    coefficients = np.array(coefficients)
+    coefficients = np.concatenate(coefficient_blocks)
+    total_energies = list(np.concatenate(total_energy_blocks))
 
     return coefficients, total_energies
 
 
 def compute_coefficients_for_shape_optimization(global_topological_coefficients, symbols):
-    coordination_numbers = list(range(13))
-    symbols_copy = copy.deepcopy(symbols)
-    symbols_copy.sort()
-
+    global_topological_coefficients = np.asarray(global_topological_coefficients)
     e_aa_bond = global_topological_coefficients[0]
 
-    coordination_energies_a = dict()
-    for index, cn in enumerate(coordination_numbers):
-        coordination_energies_a[cn] = global_topological_coefficients[index + 1]
-
-    coefficients = []
-    total_energies = []
-    for cn_number in coordination_numbers:
-        for n_symbol_a_atoms in range(cn_number + 1):
-            energy = 0
-
-            energy += (n_symbol_a_atoms*e_aa_bond/2)
-            energy += (coordination_energies_a[cn_number])
-
-            total_energy = energy + n_symbol_a_atoms*e_aa_bond/2
-
-            coefficients.append(energy)
-            total_energies.append(total_energy)
+    cn_numbers = _coordination_pairs[:, 0]
+    n_symbol_a_atoms = _coordination_pairs[:, 1]
 
-    coefficients += [0]*len(coefficients)
-    total_energies += [0]*len(total_energies)
+    energy = (n_symbol_a_atoms*e_aa_bond/2
+              + global_topological_coefficients[1 + cn_numbers])
+    total_energy = energy + n_symbol_a_atoms*e_aa_bond/2
 
-    coefficients = np.array(coefficients)
+    # the second symbol block is all zeros, as in the original padded lists
+    coefficients = np.concatenate([energy, np.zeros_like(energy)])
+    total_energies = list(np.concatenate([total_energy, np.zeros_like(total_energy)]))
 
     return coefficients, total_energies
@@ -97,6 +97,18 @@ class TOPCalculator(Calculator):
         particle.set_energy(self.energy_key, top_energy)
         return top_energy
 
+    def compute_energy_delta(self, particle, change):
+        """Update the stored energy from the feature-vector change of a local move.
+
+        The topological model is linear in the feature vector, so the energy change
+        of an exchange is the dot product of the coefficients with the change
+        returned by update_feature_vector -- no whole-particle pass needed. The
+        updated energy is stored on the particle and the delta is returned.
+        """
+        delta_e = np.dot(np.transpose(self.model.coef_), change)
+        particle.set_energy(self.energy_key, particle.get_energy(self.energy_key) + delta_e)
+        return delta_e
+
     def set_coefficients(self, coefficients):
         self.coefficients = coefficients
         self.model.coef_ = self.coefficients
@@ -2,6 +2,19 @@ import numpy as np
 from collections import defaultdict
 
 from ase import Atoms
+from ase.data import atomic_numbers, chemical_symbols
+
+try:
+    from numba import njit
+
+    @njit(cache=True)
+    def _swap_codes(codes, first, second):
+        for k in range(first.size):
+            tmp = codes[first[k]]
+            codes[first[k]] = codes[second[k]]
+            codes[second[k]] = tmp
+except ImportError:
+    _swap_codes = None
 
 # TODO Derive directly from Atoms
 
@@ -12,23 +25,67 @@ class AtomWrapper:
     This class extends an Atoms object with additional functions for ordering, stoichiometry
     handling and is split from BaseNanoparticle to keep the size of the modules as small as
     possible.
+
+    Chemical symbols are stored as a compact int8 code array (one code per distinct
+    species) so that symbol queries, swaps and stoichiometry counts operate on a flat
+    numpy array instead of Python strings. The codes are written back to the ase Atoms
+    object lazily, only when an ase representation is requested.
     """
     def __init__(self):
         self.atoms = Atoms()
+        self._rebuild_codes()
+
+    def _rebuild_codes(self):
+        """Derive the int8 code array and the code <-> symbol mapping from the ase atoms."""
+        numbers = self.atoms.numbers
+        unique_numbers = np.unique(numbers)
+        self._code_atomic_numbers = unique_numbers.astype(np.int64)
+        self._code_to_symbol = [chemical_symbols[z] for z in unique_numbers]
+        self._symbol_to_code = {s: i for i, s in enumerate(self._code_to_symbol)}
+        self._codes = np.searchsorted(unique_numbers, numbers).astype(np.int8)
+        self._symbols_synced = True
+        self._stoichiometry_cache = None
+        self._indices_by_symbol_cache = {}
+        self._positions_f32 = None
+        self._positions_f32_source = None
+
+    def _invalidate_symbol_caches(self):
+        """Drop all symbol-derived caches after a symbol-changing operation."""
+        self._symbols_synced = False
+        self._stoichiometry_cache = None
+        self._indices_by_symbol_cache = {}
 
-        return
+    def _code_for(self, symbol):
+        """Return the int8 code of the symbol, registering it if it is new."""
+        if symbol not in self._symbol_to_code:
+            self._symbol_to_code[symbol] = len(self._code_to_symbol)
+            self._code_to_symbol.append(symbol)
+            self._code_atomic_numbers = np.append(self._code_atomic_numbers,
+                                                  atomic_numbers[symbol])
+        return self._symbol_to_code[symbol]
+
+    def _sync_symbols(self):
+        """Write the code array back into the ase Atoms object if it is out of date."""
+        if not self._symbols_synced:
+            self.atoms.numbers = self._code_atomic_numbers[self._codes]
+            self._symbols_synced = True
 
     def add_atoms(self, new_atoms):
+        self._sync_symbols()
         self.atoms.extend(new_atoms)
+        self._rebuild_codes()
 
     def get_atoms(self, indices):
+        self._sync_symbols()
         return self.atoms[indices]
 
     def get_position(self, idx):
         return self.atoms[idx].position
 
     def remove_atoms(self, indices):
+        self._sync_symbols()
         del self.atoms[indices]
+        self._rebuild_codes()
 
     def get_ase_atoms(self, indices=None):
         """Return atoms specified by the indices.
@@ -36,15 +93,62 @@ class AtomWrapper:
         Parameters:
             indices: list/array of int
         """
+        self._sync_symbols()
         if indices is None:
             return self.atoms
         return self.atoms[indices]
 
     def swap_symbols(self, index_pairs):
-        for idx1, idx2 in index_pairs:
-            self.atoms[idx1].symbol, self.atoms[idx2].symbol = (
-                self.atoms[idx2].symbol, self.atoms[idx1].symbol
-            )
+        """Exchange the symbols of the given index pairs.
+
+        Accepts any iterable of (idx1, idx2) pairs or a (K, 2) int array. All K
+        proposals are applied in one fused permutation of the code array, so batched
+        MC moves pay a single numpy call instead of K Python-level swaps. Pairs within
+        one batch must be disjoint.
+        """
+        if not isinstance(index_pairs, (list, tuple, np.ndarray)):
+            index_pairs = list(index_pairs)
+        pairs = np.asarray(index_pairs, dtype=np.int64).reshape(-1, 2)
+        if _swap_codes is not None:
+            _swap_codes(self._codes, np.ascontiguousarray(pairs[:, 0]),
+                        np.ascontiguousarray(pairs[:, 1]))
+        else:
+            codes = self._codes
+            first, second = pairs[:, 0], pairs[:, 1]
+            tmp = codes[first].copy()
+            codes[first] = codes[second]
+            codes[second] = tmp
+        self._invalidate_symbol_caches()
+
+    def revert_swap(self, index_pairs):
+        """Undo a previous swap_symbols call with the same pairs.
+
+        A pairwise exchange is an involution, so reverting simply re-applies it.
+        """
+        self.swap_symbols(index_pairs)
+
+    def snapshot_symbols(self, undo_pairs=None):
+        """Return a copy of the symbol codes, ~N bytes.
+
+        With undo_pairs given, the exchange pairs are reverted inside the copy,
+        which captures the pre-exchange ordering without swapping the live codes
+        back and forth.
+        """
+        codes = self._codes.copy()
+        if undo_pairs is not None:
+            if not isinstance(undo_pairs, (list, tuple, np.ndarray)):
+                undo_pairs = list(undo_pairs)
+            pairs = np.asarray(undo_pairs, dtype=np.int64).reshape(-1, 2)
+            first, second = pairs[:, 0], pairs[:, 1]
+            tmp = codes[first].copy()
+            codes[first] = codes[second]
+            codes[second] = tmp
+        return codes
+
+    def restore_symbols(self, codes):
+        """Overwrite the symbol codes with a snapshot_symbols copy."""
+        np.copyto(self._codes, codes)
+        self._invalidate_symbol_caches()
 
     def random_ordering(self, new_stoichiometry):
         """Creates a random chemical ordering for the given stoichiometry
@@ -55,15 +159,16 @@ class AtomWrapper:
         Parameters:
             new_stoichiometry: dict
         """
-        new_symbols = []
-        for symbol in new_stoichiometry:
-            new_symbols += [symbol]*new_stoichiometry[symbol]
-        np.random.shuffle(new_symbols)
-        self.atoms.symbols = new_symbols
+        codes = np.concatenate([np.full(count, self._code_for(symbol), dtype=np.int8)
+                                for symbol, count in new_stoichiometry.items()])
+        np.random.shuffle(codes)
+        self._codes = codes
+        self._invalidate_symbol_caches()
 
     def transform_atoms(self, atom_indices, new_symbols):
-        for idx, symbol in zip(atom_indices, new_symbols):
-            self.atoms[idx].symbol = symbol
+        new_codes = [self._code_for(symbol) for symbol in new_symbols]
+        self._codes[np.asarray(atom_indices, dtype=np.int64)] = new_codes
+        self._invalidate_symbol_caches()
 
     def get_indices(self):
         """Convenience function for range(n_atoms)."""
@@ -71,12 +176,13 @@ class AtomWrapper:
 
     def get_all_symbols(self):
         """Return list of symbols which occur at least once in the particle."""
-        return list(self.atoms.symbols.species())
+        return [self._code_to_symbol[code] for code in np.unique(self._codes)]
 
     def get_symbol(self, atom_idx):
-        return self.atoms[atom_idx].symbol
+        return self._code_to_symbol[self._codes[atom_idx]]
 
     def get_symbols(self, indices=None):
+        self._sync_symbols()
         if indices is None:
             return self.atoms.symbols
         return self.atoms[indices].symbols
@@ -87,40 +193,70 @@ class AtomWrapper:
         Parameters:
             symbol : str
         """
-        if symbol in self.atoms.symbols.indices():
-            return self.atoms.symbols.indices()[symbol]
-        else:
-            return np.array([])
+        if symbol not in self._indices_by_symbol_cache:
+            code = self._symbol_to_code.get(symbol)
+            if code is None:
+                return np.array([])
+            self._indices_by_symbol_cache[symbol] = np.nonzero(self._codes == code)[0]
+        return self._indices_by_symbol_cache[symbol]
 
     def get_n_atoms(self):
         """Return the number of atoms."""
         return len(self.atoms)
 
-    # TODO implement more efficiently using in-built ase methods
     def get_n_atoms_of_symbol(self, symbol):
-        return len(self.get_indices_by_symbol(symbol))
+        code = self._symbol_to_code.get(symbol)
+        if code is None:
+            return 0
+        return int(np.count_nonzero(self._codes == code))
 
     def get_stoichiometry(self):
         """Return the current composition as defaultdict.
 
         For symbols that are not in the particle, the defaultdict will evaluate to 0.
+        The caller gets its own copy; reading a missing key or mutating the result
+        cannot corrupt the cache.
         """
-        stoichiometry = self.atoms.symbols.indices()
-        for symbol in stoichiometry:
-            stoichiometry[symbol] = len(stoichiometry[symbol])
-        return defaultdict(lambda: 0, stoichiometry)
+        if self._stoichiometry_cache is None:
+            counts = np.bincount(self._codes.astype(np.int64),
+                                 minlength=len(self._code_to_symbol))
+            stoichiometry = {self._code_to_symbol[code]: int(count)
+                             for code, count in enumerate(counts) if count > 0}
+            # int as the default factory, not a lambda: identical semantics and
+            # it keeps the wrapper picklable for multiprocessing
+            self._stoichiometry_cache = defaultdict(int, stoichiometry)
+        return self._stoichiometry_cache.copy()
 
-    def get_positions(self, indices=None):
+    def get_positions(self, indices=None, dtype=None):
         """Return the positions of the atoms.
 
         If indices is not specified, all atoms will be returned.
 
         Parameters:
             indices : list/array of int
+
+            dtype : numpy dtype
+            Optional target dtype. Descriptor kernels can request np.float32, which
+            halves the memory bandwidth of the inner loops; the float32 copy is cached
+            and reused until the positions change. ASE itself keeps working in float64.
         """
+        if dtype is not None and np.dtype(dtype) == np.float32:
+            positions64 = self.atoms.positions
+            # positions can be mutated in place behind our back (e.g. an ase
+            # relaxation on the live atoms), so the cache is validated against
+            # a retained copy of the source instead of invalidation hooks
+            if (self._positions_f32 is None
+                    or not np.array_equal(positions64, self._positions_f32_source)):
+                self._positions_f32 = positions64.astype(np.float32)
+                self._positions_f32_source = positions64.copy()
+            positions = self._positions_f32
+        else:
+            positions = self.atoms.positions
+
         if indices is None:
-            return self.atoms.positions
-        return self.atoms[indices].positions
+            return positions
+        return positions[np.asarray(indices)]
 
     def translate_atoms_positions(self, position):
         self.atoms.translate(-position)
+        self._positions_f32 = None
@@ -1,11 +1,83 @@
+import collections
+
+import numpy as np
+
 from ase import Atoms
 from ase.io import read, write
 import pickle
+
+try:
+    import msgpack
+    import msgpack_numpy
+    msgpack_numpy.patch()
+except ImportError:
+    msgpack = None
+
 from npl.core.atom_wrapper import AtomWrapper
 from npl.core.neighbor_list import NeighborList
 from npl.core.adsorption import AdsorptionSiteList
 from npl.utils import get_crystalline_structure
 
+try:
+    from numba import njit
+
+    @njit(cache=True)
+    def _filter_by_coordination(cns, cn_targets, codes, target_code):
+        out = np.empty(cns.size, np.int64)
+        k = 0
+        for i in range(cns.size):
+            hit = False
+            for j in range(cn_targets.size):
+                if cns[i] == cn_targets[j]:
+                    hit = True
+                    break
+            if hit and (target_code < 0 or codes[i] == target_code):
+                out[k] = i
+                k += 1
+        return out[:k]
+except ImportError:
+    _filter_by_coordination = None
+
+# Pool of reusable particle instances for allocation-heavy loops, see
+# acquire_particle()/release_particle().
+_PARTICLE_POOL = collections.deque(maxlen=1024)
+
+# Builders for the serializable fields of get_as_dictionary(). Each entry is only
+# evaluated when its field is actually requested, so e.g. the neighbor-list dict is
+# not materialized when a caller just wants the energies.
+_FIELD_BUILDERS = {
+    'energies': lambda particle: particle.energies,
+    'symbols': lambda particle: list(particle.atoms.get_symbols()),
+    'positions': lambda particle: particle.atoms.get_positions(),
+    'atom_features': lambda particle: particle.atom_features,
+    'local environments': lambda particle: particle.local_environments,
+    'neighbor_list': lambda particle: particle.neighbor_list.list,
+    'feature_vectors': lambda particle: particle.feature_vectors,
+}
+
+
+class SharedGeometry:
+    """Immutable geometry shared by particles that differ only in their ordering.
+
+    Holds the positions and the CSR neighbor arrays as read-only ndarrays. Particles
+    bound to the same SharedGeometry reference these arrays instead of copying them,
+    so a swap-only Monte Carlo ensemble pays one code array (N bytes) per clone
+    rather than positions (24N bytes) plus a neighbor list.
+    """
+    def __init__(self, positions, indptr, neighbors):
+        self.positions = np.ascontiguousarray(positions, dtype=np.float64)
+        self.indptr = np.ascontiguousarray(indptr, dtype=np.int32)
+        self.neighbors = np.ascontiguousarray(neighbors, dtype=np.int32)
+        for array in (self.positions, self.indptr, self.neighbors):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_particle(cls, particle):
+        """Extract the (validated) geometry of an existing particle."""
+        particle._ensure_neighbor_list()
+        return cls(particle.atoms.get_positions(), particle.neighbor_list.indptr,
+                   particle.neighbor_list.neighbors)
+
 
 # TODO update local environment handling with keys
 class BaseNanoparticle:
@@ -27,16 +99,107 @@ class BaseNanoparticle:
         atom_features (dict): A dictionary to store atomic features.
         feature_vectors (dict): A dictionary to store feature vectors.
         """
-    def __init__(self):
+    def __init__(self, geometry=None):
         self.atoms = AtomWrapper()
         self.neighbor_list = NeighborList()
-        self.adsorption_site_list = AdsorptionSiteList()
+        self._adsorption_site_list = None
+        self._nl_valid = False
+        self._pair_neighborhoods = dict()
 
         self.energies = dict()
 
-        self.local_environments = dict()
-        self.atom_features = dict()
-        self.feature_vectors = dict()
+        self._local_environments = None
+        self._atom_features = None
+        self._feature_vectors = None
+
+        if geometry is not None:
+            self.bind_geometry(geometry)
+
+    def bind_geometry(self, geometry):
+        """Attach a SharedGeometry without copying its arrays.
+
+        The particle references the shared read-only positions and neighbor arrays
+        directly; only the per-particle symbol codes are owned by this instance. All
+        atoms start out as vacancies ('X') until an ordering is assigned.
+
+        Parameters:
+            geometry: SharedGeometry
+        """
+        atoms = Atoms(['X'] * len(geometry.positions))
+        positions_view = geometry.positions.view()
+        positions_view.flags.writeable = False
+        atoms.arrays['positions'] = positions_view
+        self.atoms.atoms = atoms
+        self.atoms._rebuild_codes()
+
+        self.neighbor_list.indptr = geometry.indptr
+        self.neighbor_list.neighbors = geometry.neighbors
+        self._nl_valid = len(self.neighbor_list) > 0
+        self._pair_neighborhoods.clear()
+
+    @property
+    def adsorption_site_list(self):
+        """AdsorptionSiteList, constructed lazily on first access.
+
+        Workflows that never touch adsorption (cluster-expansion training, bulk
+        descriptor computation) skip the construction cost entirely.
+        """
+        if self._adsorption_site_list is None:
+            self._adsorption_site_list = AdsorptionSiteList()
+        return self._adsorption_site_list
+
+    @adsorption_site_list.setter
+    def adsorption_site_list(self, value):
+        self._adsorption_site_list = value
+
+    @property
+    def local_environments(self):
+        if self._local_environments is None:
+            self._local_environments = dict()
+        return self._local_environments
+
+    @local_environments.setter
+    def local_environments(self, value):
+        self._local_environments = value
+
+    @property
+    def atom_features(self):
+        if self._atom_features is None:
+            self._atom_features = dict()
+        return self._atom_features
+
+    @atom_features.setter
+    def atom_features(self, value):
+        self._atom_features = value
+
+    @property
+    def feature_vectors(self):
+        if self._feature_vectors is None:
+            self._feature_vectors = dict()
+        return self._feature_vectors
+
+    @feature_vectors.setter
+    def feature_vectors(self, value):
+        self._feature_vectors = value
+
+    def reset(self):
+        """Reset the particle for reuse without releasing its allocations.
+
+        Clears energies, local environments, atom features and feature vectors in
+        place, blanks the chemical ordering and marks the neighbor list stale. The
+        geometry arrays stay allocated so pooled instances (see acquire_particle)
+        can be recycled across Monte Carlo trials without allocator/GC pressure.
+        """
+        self.energies.clear()
+        for lazy_dict in (self._local_environments, self._atom_features,
+                          self._feature_vectors):
+            if lazy_dict is not None:
+                lazy_dict.clear()
+        self.atoms._codes.fill(0)
+        self.atoms._invalidate_symbol_caches()
+        self._nl_valid = False
+        self._pair_neighborhoods.clear()
+        return self
 
     def get_geometrical_data(self):
         """Return the geometrical information of the nanoparticle as dictionary.
@@ -63,21 +226,9 @@ class BaseNanoparticle:
 
         """
 
-        full_particle_dict = {'energies': self.energies,
-                              'symbols': list(self.atoms.get_symbols()),
-                              'positions': self.atoms.get_positions(),
-                              'atom_features': self.atom_features,
-                              'local environments': self.local_environments,
-                              'neighbor_list': dict(self.neighbor_list.list),
-                              'feature_vectors': self.feature_vectors}
-
         if fields is None:
-            return full_particle_dict
-        else:
-            data = {}
-            for field in fields:
-                data[field] = full_particle_dict[field]
-            return data
+            fields = _FIELD_BUILDERS
+        return {field: _FIELD_BUILDERS[field](self) for field in fields}
 
     def save_npl_format(self, filename, fields, filename_geometry=None):
         """Save the nanoparticle by first exporting it to a dictionary and then using pickle.
@@ -98,12 +249,90 @@ class BaseNanoparticle:
             Filename of file in which the geometrical information will be stored. This is
             independent of the fields variable.
         """
-        data = self.get_as_dictionary(fields)
-        pickle.dump(data, open(filename, 'wb'))
+        if str(filename).endswith('.npz'):
+            self._save_npz(filename)
+        else:
+            data = self.get_as_dictionary(fields)
+            self._dump_npl_dict(data, filename)
 
         if filename_geometry is not None:
             geometrical_data = self.get_geometrical_data()
-            pickle.dump(geometrical_data, open(filename_geometry, 'wb'))
+            self._dump_npl_dict(geometrical_data, filename_geometry)
+
+    def _save_npz(self, filename):
+        """Store the numeric core of the particle as a compressed .npz archive.
+
+        Positions, the CSR neighbor arrays, the symbol codes and the energies are
+        written as typed numpy arrays with no Python-object overhead, which is both
+        much smaller and much faster to load than the pickled dict-of-lists format.
+        """
+        np.savez_compressed(
+            filename,
+            positions=self.atoms.get_positions(),
+            indptr=self.neighbor_list.indptr,
+            neighbors=self.neighbor_list.neighbors,
+            codes=self.atoms._codes,
+            code_symbols=np.array(self.atoms._code_to_symbol),
+            energy_keys=np.array(list(self.energies.keys())),
+            energy_values=np.array(list(self.energies.values()), dtype=np.float64))
+
+    def _load_npz(self, filename):
+        """Rebuild the particle from a .npz archive written by _save_npz."""
+        data = np.load(filename, mmap_mode='r')
+
+        code_symbols = data['code_symbols']
+        symbols = [str(code_symbols[code]) for code in data['codes']]
+        self.atoms.add_atoms(Atoms(symbols, np.asarray(data['positions'])))
+
+        self.neighbor_list.indptr = np.asarray(data['indptr'], dtype=np.int32)
+        self.neighbor_list.neighbors = np.asarray(data['neighbors'], dtype=np.int32)
+        self._nl_valid = len(self.neighbor_list) > 0
+        self._pair_neighborhoods.clear()
+
+        self.energies = {str(key): float(value)
+                         for key, value in zip(data['energy_keys'], data['energy_values'])}
+
+    @staticmethod
+    def _dump_npl_dict(data, filename):
+        """Serialize a particle dictionary to disk.
+
+        Uses msgpack when available, which serializes the primitive dict/list payloads
+        (neighbor list, energies, symbols) considerably faster than pickle and produces
+        smaller files. Falls back to pickle when msgpack is not installed.
+        """
+        if msgpack is not None:
+            if 'neighbor_list' in data:
+                # convert the sets and numpy ints to plain int lists once before packing
+                data = dict(data)
+                data['neighbor_list'] = {int(k): [int(x) for x in v]
+                                         for k, v in data['neighbor_list'].items()}
+            with open(filename, 'wb') as f:
+                f.write(msgpack.packb(data, use_bin_type=True))
+        else:
+            if 'neighbor_list' in data:
+                # defaultdicts built with a lambda factory cannot be pickled
+                data = dict(data)
+                data['neighbor_list'] = dict(data['neighbor_list'])
+            with open(filename, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _load_npl_dict(filename):
+        """Deserialize a particle dictionary written by _dump_npl_dict.
+
+        Files written before the msgpack migration start with the pickle PROTO opcode
+        (0x80 followed by the protocol number), so legacy pickles remain readable.
+        """
+        with open(filename, 'rb') as f:
+            raw = f.read()
+
+        if msgpack is None or (len(raw) > 1 and raw[0] == 0x80 and raw[1] <= 5):
+            return pickle.loads(raw)
+
+        data = msgpack.unpackb(raw, raw=False, strict_map_key=False)
+        if 'neighbor_list' in data:
+            data['neighbor_list'] = {k: set(v) for k, v in data['neighbor_list'].items()}
+        return data
 
     def build_from_dictionary(self, particle_dict, geometrical_dict=None):
         """Construct a nanoparticle based on a representation as dictionary.
@@ -158,6 +387,9 @@ class BaseNanoparticle:
             if 'local_environments' in particle_dict:
                 self.local_environments = particle_dict['local_environments']
 
+        self._nl_valid = len(self.neighbor_list) > 0
+        self._pair_neighborhoods.clear()
+
     def load_npl_format(self, filename, filename_geometry=None):
         """Load a nanoparticle file in the NPL format.
 
@@ -171,13 +403,17 @@ class BaseNanoparticle:
             filename_geometry: str
             Filename of geometrical data.
         """
+        if filename is not None and str(filename).endswith('.npz'):
+            self._load_npz(filename)
+            return
+
         if filename is not None:
-            dictionary = pickle.load(open(filename, 'rb'))
+            dictionary = self._load_npl_dict(filename)
         else:
             dictionary = None
 
         if filename_geometry is not None:
-            topological_data = pickle.load(open(filename_geometry, 'rb'))
+            topological_data = self._load_npl_dict(filename_geometry)
             self.build_from_dictionary(dictionary, topological_data)
         else:
             self.build_from_dictionary(dictionary)
@@ -230,6 +466,7 @@ class BaseNanoparticle:
         if crystal:
             atoms = get_crystalline_structure(atoms)
         self.atoms.add_atoms(atoms)
+        self._nl_valid = False
 
         if recompute_neighbor_list:
             self.construct_neighbor_list()
@@ -247,6 +484,7 @@ class BaseNanoparticle:
             recompute_neighbor_list: bool
         """
         self.atoms.remove_atoms(atom_indices)
+        self._nl_valid = False
 
         if recompute_neighbor_list:
             self.construct_neighbor_list()
@@ -256,12 +494,90 @@ class BaseNanoparticle:
 
         Parameters:
 
-            index_pairs: list of tuple
+            index_pairs: list of tuple or (K, 2) int array
             List that contains tuples which contain two indices, respectively, of atoms where the
-            symbols will be exchanged.
+            symbols will be exchanged. A (K, 2) array applies all K disjoint exchanges in a
+            single batched operation.
         """
         self.atoms.swap_symbols(index_pairs)
 
+    def revert_swap_symbols(self, index_pairs):
+        """Undo a previous swap_symbols call with the same index pairs.
+
+        Parameters:
+
+            index_pairs: list of tuple or (K, 2) int array
+        """
+        self.atoms.revert_swap(index_pairs)
+
+    def snapshot_symbols(self, undo_pairs=None):
+        """Capture only the chemical ordering as a flat code array.
+
+        This is the cheapest best-state bookkeeping for the optimization loops:
+        ~N bytes against the full state captured by snapshot(). Passing the
+        exchange pairs of the current step reverts them inside the copy, so the
+        pre-exchange ordering is captured without double-swapping the particle.
+
+        Parameters:
+
+            undo_pairs: list of tuple or (K, 2) int array, optional
+        """
+        return self.atoms.snapshot_symbols(undo_pairs)
+
+    def restore_symbols(self, codes):
+        """Restore a chemical ordering captured by snapshot_symbols.
+
+        Only the symbols are written back; energies, features and local
+        environments are left untouched and may need recomputation. The codes
+        are only meaningful on a particle sharing the code mapping of the
+        snapshot source, e.g. the source itself or a deepcopy of it.
+
+        Parameters:
+
+            codes: int8 array from snapshot_symbols
+        """
+        self.atoms.restore_symbols(codes)
+
+    def snapshot(self):
+        """Capture the state mutated by Monte Carlo moves as a lightweight snapshot.
+
+        Copies the symbol codes, the energies and the feature data, i.e. everything
+        an exchange move can touch. This replaces copy.deepcopy for best-particle
+        bookkeeping in the optimization loops, which would otherwise duplicate the
+        geometry and neighbor list on every improvement.
+        """
+        return {'codes': self.atoms._codes.copy(),
+                'energies': dict(self.energies),
+                'feature_vectors': {key: np.copy(vector)
+                                    for key, vector in self.feature_vectors.items()},
+                'atom_features': {key: self._copy_atom_features(features)
+                                  for key, features in self.atom_features.items()},
+                'local_environments': dict(self.local_environments)}
+
+    @staticmethod
+    def _copy_atom_features(features):
+        # global classifiers store one (n_atoms, n_features) array, local
+        # classifiers a dict of per-atom features
+        if isinstance(features, dict):
+            return dict(features)
+        return np.copy(features)
+
+    def restore(self, snapshot):
+        """Restore the state captured by a previous snapshot() call.
+
+        The snapshot only covers the chemical ordering and derived quantities; the
+        particle must still hold the geometry the snapshot was taken from.
+        """
+        np.copyto(self.atoms._codes, snapshot['codes'])
+        self.atoms._invalidate_symbol_caches()
+        self.energies = dict(snapshot['energies'])
+        self._feature_vectors = {key: np.copy(vector)
+                                 for key, vector in snapshot['feature_vectors'].items()}
+        self._atom_features = {key: self._copy_atom_features(features)
+                               for key, features in snapshot['atom_features'].items()}
+        self._local_environments = dict(snapshot['local_environments'])
+        return self
+
     def transform_atoms(self, atom_indices, new_symbols):
         """Change the symbol for the given atoms.
 
@@ -291,16 +607,16 @@ class BaseNanoparticle:
         # account for stoichiometries given as proportions instead of absolute numbers
         if sum(stoichiometry.values()) == 1:
             n_atoms = self.atoms.get_n_atoms()
-            transformed_stoichiometry = dict()
-            for symbol in sorted(stoichiometry):
-                transformed_stoichiometry[symbol] = int(n_atoms * stoichiometry[symbol])
+            symbols = sorted(stoichiometry)
+            counts = np.array([int(n_atoms * stoichiometry[symbol]) for symbol in symbols])
 
-            # adjust for round-off error
-            if sum(transformed_stoichiometry.values()) != n_atoms:
-                diff = n_atoms - sum(transformed_stoichiometry.values())
-                transformed_stoichiometry[sorted(stoichiometry)[0]] += diff
+            # int() floors, so distribute the round-off residual over random species
+            residual = n_atoms - counts.sum()
+            if residual:
+                np.add.at(counts, np.random.choice(len(symbols), residual), 1)
 
-            # print('Resulting stoichiometry: {}'.format(transformed_stoichiometry))
+            transformed_stoichiometry = {symbol: int(count)
+                                         for symbol, count in zip(symbols, counts)}
             self.atoms.random_ordering(transformed_stoichiometry)
         else:
             self.atoms.random_ordering(stoichiometry)
@@ -322,6 +638,7 @@ class BaseNanoparticle:
 
     def get_n_bonds(self):
         """Return the number of bonds, requires valid neighbor list."""
+        self._ensure_neighbor_list()
         return self.neighbor_list.get_n_bonds()
 
     def get_all_symbols(self):
@@ -357,6 +674,45 @@ class BaseNanoparticle:
         """
         stripped_atoms = self.get_ase_atoms(exclude_x=exclude_x)
         self.neighbor_list.construct(stripped_atoms, scale_factor=scale_factor)
+        self._nl_valid = True
+        self._pair_neighborhoods.clear()
+
+    def _ensure_neighbor_list(self):
+        """Construct the neighbor list lazily if the geometry changed since the last build.
+
+        Symbol-changing operations (swap_symbols, transform_atoms, random_ordering) leave
+        the positions untouched and therefore keep the neighbor list valid, which avoids
+        redundant O(N) reconstruction in Monte Carlo exchange loops.
+        """
+        if not self._nl_valid:
+            self.construct_neighbor_list()
+
+    def get_pair_neighborhood(self, index1, index2):
+        """Return the joint neighborhood of an exchange pair as frozenset.
+
+        The set contains both indices and all their neighbors. Exchange operators
+        propose the same index pairs over and over during a Monte Carlo run, so the
+        neighborhoods are memoized per pair; the cache is dropped whenever the
+        neighbor list is rebuilt or replaced.
+
+        Parameters:
+
+            index1: int
+
+            index2: int
+        """
+        key = (index1, index2)
+        neighborhood = self._pair_neighborhoods.get(key)
+        if neighborhood is None:
+            self._ensure_neighbor_list()
+            if len(self._pair_neighborhoods) >= 8192:
+                self._pair_neighborhoods.clear()
+            union = {index1, index2}
+            union.update(map(int, self.neighbor_list[index1]))
+            union.update(map(int, self.neighbor_list[index2]))
+            neighborhood = frozenset(union)
+            self._pair_neighborhoods[key] = neighborhood
+        return neighborhood
 
     def get_atom_indices_from_coordination_number(self, coordination_numbers, symbol=None):
         """Return atom indices of atoms with certain coordination numbers.
@@ -367,13 +723,33 @@ class BaseNanoparticle:
             coordination_numbers : list/array of int
             symbol : str
         """
-        if symbol is None:
-            return list(
-                filter(lambda x: self.get_coordination_number(x) in coordination_numbers,
-                       self.atoms.get_indices()))
-        else:
-            return list(filter(lambda x: self.get_coordination_number(x) in coordination_numbers
-                        and self.atoms.get_symbol(x) == symbol, self.atoms.get_indices()))
+        self._ensure_neighbor_list()
+        n_atoms = self.atoms.get_n_atoms()
+        coordination_numbers_per_atom = np.diff(self.neighbor_list.indptr)
+        if coordination_numbers_per_atom.size < n_atoms:
+            # atoms outside the neighbor list (e.g. vacancies) count as uncoordinated
+            padding = np.zeros(n_atoms - coordination_numbers_per_atom.size,
+                               dtype=coordination_numbers_per_atom.dtype)
+            coordination_numbers_per_atom = np.concatenate([coordination_numbers_per_atom,
+                                                            padding])
+
+        if _filter_by_coordination is not None:
+            if symbol is None:
+                target_code = -1
+            else:
+                target_code = self.atoms._symbol_to_code.get(symbol, None)
+                if target_code is None:
+                    return []
+            indices = _filter_by_coordination(
+                coordination_numbers_per_atom.astype(np.int64),
+                np.asarray(coordination_numbers, dtype=np.int64),
+                self.atoms._codes, np.int64(target_code))
+            return indices.tolist()
+
+        mask = np.isin(coordination_numbers_per_atom, np.asarray(coordination_numbers))
+        if symbol is not None:
+            mask &= np.array(list(self.atoms.get_symbols())) == symbol
+        return np.nonzero(mask)[0].tolist()
 
     def get_coordination_number(self, atom_idx):
         """
@@ -388,6 +764,7 @@ class BaseNanoparticle:
         Returns:
         int: The coordination number of the specified atom.
         """
+        self._ensure_neighbor_list()
         return self.neighbor_list.get_coordination_number(atom_idx)
 
     def get_coordination_atoms(self, atom_idx):
@@ -400,6 +777,7 @@ class BaseNanoparticle:
         Returns:
         list: A list of coordination atoms for the specified atom index.
         """
+        self._ensure_neighbor_list()
         return self.neighbor_list.get_coordination_atoms(atom_idx)
 
     def get_generalized_coordination_number(self, indices):
@@ -413,6 +791,7 @@ class BaseNanoparticle:
         Returns:
         float: The generalized coordination number for the specified indices.
         """
+        self._ensure_neighbor_list()
         return self.neighbor_list.get_generalized_coordination_number(indices)
 
     def get_generalized_coordination_numbers(self, sites):
@@ -432,14 +811,27 @@ class BaseNanoparticle:
                   are lists of sites that have the corresponding generalized coordination number.
         """
 
-        gcn_dict = dict()
-        for site in sites:
-            gen_cn = self.get_generalized_coordination_number(site)
-            try:
-                gcn_dict[gen_cn].append(site)
-            except KeyError:
-                gcn_dict[gen_cn] = [site]
-        return gcn_dict
+        self._ensure_neighbor_list()
+        sites = list(sites)
+        if not sites:
+            return {}
+
+        neighbor_list = self.neighbor_list
+        coordination_numbers = np.diff(neighbor_list.indptr)
+        if all(len(site) == 1 for site in sites) and np.all(coordination_numbers > 0):
+            # single-atom sites have no shared neighbors, so their GCN reduces to the
+            # sum of the neighbors' coordination numbers over CN_max = 12
+            site_indices = np.array([site[0] for site in sites])
+            neighbor_cn_sums = np.add.reduceat(coordination_numbers[neighbor_list.neighbors],
+                                               neighbor_list.indptr[:-1])
+            gcn_values = np.round(neighbor_cn_sums[site_indices] / 12, 2)
+        else:
+            gcn_values = np.array([self.get_generalized_coordination_number(site)
+                                   for site in sites])
+
+        unique_values, inverse = np.unique(gcn_values, return_inverse=True)
+        return {float(value): [sites[j] for j in np.nonzero(inverse == i)[0]]
+                for i, value in enumerate(unique_values)}
 
     def get_atoms_in_the_surface_plane(self, atom_idx, edges_corner=False):
         """
@@ -458,6 +850,7 @@ class BaseNanoparticle:
         list
             A list of atom indices that are in the surface plane.
         """
+        self._ensure_neighbor_list()
         return self.neighbor_list.get_atoms_in_the_surface_plane(atom_idx,
                                                                  edges_corner=edges_corner)
 
@@ -472,6 +865,7 @@ class BaseNanoparticle:
         Returns:
             list: A list containing the neighboring particles.
         """
+        self._ensure_neighbor_list()
         return self.neighbor_list
 
     def get_ase_atoms(self, indices=None, exclude_x=True):
@@ -489,13 +883,16 @@ class BaseNanoparticle:
             e.g. for energy calculations
         """
         if exclude_x and 'X' in self.get_stoichiometry():
-            vacancies = self.get_indices_by_symbol('X')
-            if indices is None:
-                valid_indices = set(self.get_indices()).difference(vacancies)
-            else:
-                valid_indices = set(indices).difference(vacancies)
-
-            return self.atoms.get_ase_atoms(list(valid_indices))
+            # boolean mask instead of a set difference: keeps the atoms in source order
+            # (ASE relies on stable ordering) and avoids hashing N Python ints
+            mask = np.ones(self.get_n_atoms(), dtype=bool)
+            mask[self.get_indices_by_symbol('X')] = False
+            if indices is not None:
+                selected = np.zeros(self.get_n_atoms(), dtype=bool)
+                selected[np.asarray(indices)] = True
+                mask &= selected
+
+            return self.atoms.get_ase_atoms(np.nonzero(mask)[0])
         else:
             return self.atoms.get_ase_atoms(indices)
 
@@ -734,3 +1131,21 @@ class BaseNanoparticle:
                                      swapped.
         """
         self.adsorption_site_list.swap_status(index_pairs)
+
+
+def acquire_particle():
+    """Check a reusable BaseNanoparticle out of the module-level pool.
+
+    Returns a reset instance from the pool when one is available, otherwise a
+    freshly constructed one. Return instances with release_particle() once a
+    trial is finished.
+    """
+    try:
+        return _PARTICLE_POOL.pop()
+    except IndexError:
+        return BaseNanoparticle()
+
+
+def release_particle(particle):
+    """Reset a particle and return it to the module-level pool for reuse."""
+    _PARTICLE_POOL.append(particle.reset())
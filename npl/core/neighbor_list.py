@@ -1,5 +1,3 @@
-from collections import defaultdict
-
 import numpy as np
 import itertools
 
@@ -8,14 +6,57 @@ from ase.neighborlist import build_neighbor_list
 
 
 class NeighborList:
+    """Neighbor list stored in a compressed sparse row (CSR) layout.
+
+    The neighbors of all atoms live in two contiguous int32 arrays: `indptr` of
+    length N+1 and `neighbors` of length n_bonds*2. The neighbors of atom i are
+    `neighbors[indptr[i]:indptr[i+1]]`, which makes coordination-number queries O(1)
+    and keeps hot traversal loops on flat arrays instead of a dict of Python sets.
+    The legacy dict-of-sets representation is still available through the `list`
+    property for serialization and backwards compatibility.
+    """
     def __init__(self):
-        self.list = defaultdict(lambda: set())
+        self.indptr = np.zeros(1, dtype=np.int32)
+        self.neighbors = np.zeros(0, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.indptr) - 1
 
     def __getitem__(self, item):
-        return self.list[item]
+        item = int(item)
+        if item < 0 or item >= len(self.indptr) - 1:
+            return self.neighbors[:0]
+        return self.neighbors[self.indptr[item]:self.indptr[item + 1]]
 
     def __setitem__(self, key, value):
-        self.list[key] = value
+        neighbor_dict = self.list
+        neighbor_dict[int(key)] = set(value)
+        self.list = neighbor_dict
+
+    @property
+    def list(self):
+        """Legacy dict-of-sets view of the neighbor list, materialized on demand."""
+        return {i: set(map(int, self[i])) for i in range(len(self))}
+
+    @list.setter
+    def list(self, neighbor_dict):
+        if len(neighbor_dict) == 0:
+            self.indptr = np.zeros(1, dtype=np.int32)
+            self.neighbors = np.zeros(0, dtype=np.int32)
+            return
+        n_atoms = max(map(int, neighbor_dict)) + 1
+        rows = [np.array(sorted(neighbor_dict.get(i, ())), dtype=np.int32)
+                for i in range(n_atoms)]
+        self._set_rows(rows)
+
+    def _set_rows(self, rows):
+        lengths = np.array([len(row) for row in rows], dtype=np.int32)
+        self.indptr = np.zeros(len(rows) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=self.indptr[1:])
+        if rows:
+            self.neighbors = np.concatenate(rows).astype(np.int32, copy=False)
+        else:
+            self.neighbors = np.zeros(0, dtype=np.int32)
 
     def construct(self, atoms, scale_factor=1.0, npl=True, cutoffs=None):
 
@@ -27,22 +68,25 @@ class NeighborList:
                                             bothways=True,
                                             self_interaction=False)
 
+        rows = []
         for atom_idx, _ in enumerate(atoms):
             neighbors, _ = neighbor_list.get_neighbors(atom_idx)
             if npl:
-                self.list[atom_idx] = set(neighbors)
-            else:
-                self.list[atom_idx] = neighbors
+                neighbors = np.unique(neighbors)
+            rows.append(np.asarray(neighbors, dtype=np.int32))
+        self._set_rows(rows)
 
     def get_coordination_number(self, atom_idx):
-        return len(self.list[atom_idx])
+        atom_idx = int(atom_idx)
+        if atom_idx < 0 or atom_idx >= len(self.indptr) - 1:
+            return 0
+        return int(self.indptr[atom_idx + 1] - self.indptr[atom_idx])
 
     def get_n_bonds(self):
-        n_bonds = sum([len(neigbours) for neigbours in list(self.list.values())])
-        return n_bonds/2
+        return self.neighbors.size / 2
 
     def get_coordination_atoms(self, atom_idx):
-        return list(self.list[atom_idx])
+        return self[atom_idx]
 
     def get_max_coordination_number(self, indices):
         if len(indices) == 1:
@@ -56,7 +100,7 @@ class NeighborList:
 
         common_atom_indices = []
         for pair in itertools.combinations(indices, 2):
-            shared_pair = list(np.intersect1d(self.get_coordination_atoms(pair[0]), 
+            shared_pair = list(np.intersect1d(self.get_coordination_atoms(pair[0]),
                                               self.get_coordination_atoms(pair[1])))
             common_atom_indices += shared_pair
 
@@ -64,16 +108,11 @@ class NeighborList:
 
     def get_generalized_coordination_number(self, indices):
         max_coordination = self.get_max_coordination_number(indices)
-        coordination_atoms = []
-        for atom_idx in indices:
-            for neigh in self.get_coordination_atoms(atom_idx):
-                if neigh not in coordination_atoms and neigh not in indices:
-                    coordination_atoms.append(neigh)
-
-        tot_cns = 0
-        for neighbor_idx in coordination_atoms:
-            cn = self.get_coordination_number(neighbor_idx)
-            tot_cns += cn
+        site_indices = np.asarray(list(indices))
+        all_neighbors = np.unique(np.concatenate([self[i] for i in site_indices]))
+        coordination_atoms = all_neighbors[~np.isin(all_neighbors, site_indices)]
+        tot_cns = int((self.indptr[coordination_atoms + 1]
+                       - self.indptr[coordination_atoms]).sum())
 
         return round(tot_cns / max_coordination, 2)
 
@@ -94,7 +133,7 @@ class NeighborList:
 
         if edges_corner:
             for atom_idx in atoms_indices_in_plane:
-                neighbors = self.get_coordination_atoms(atom_idx) 
+                neighbors = self.get_coordination_atoms(atom_idx)
                 for neighbor in neighbors:
                     cn_neighbor = self.get_coordination_number(neighbor)
                     if cn_neighbor < cn and neighbor not in atoms_indices_in_plane:
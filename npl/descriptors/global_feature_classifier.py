@@ -270,6 +270,20 @@ class ExtendedTopologicalFeaturesClassifier(GlobalFeatureClassifier):
 
         return old_atom_features, change
 
+    def update_and_score(self, particle, neighborhood, energy_coeffs):
+        """Fused update_feature_vector plus linear energy scoring.
+
+        Updates the atom features and the feature vector exactly like
+        update_feature_vector and scores the accumulated change against the
+        linear model coefficients in the same pass, so the affected feature
+        rows are traversed once instead of being written here and re-read by
+        the energy calculator. Returns (old_atom_features, change, delta_e);
+        a rejected move is still rolled back with downgrade_feature_vector.
+        """
+        old_atom_features, change = self.update_feature_vector(particle, neighborhood)
+        delta_e = np.dot(energy_coeffs, change)
+        return old_atom_features, change, delta_e
+
     def downgrade_feature_vector(self, particle, neighborhood, old_atom_features, change):
         feature_vector = particle.get_feature_vector(self.feature_key)
 
@@ -60,9 +60,11 @@ class SOAPCalculator(LocalEnvironmentCalculator):
 
             neighbors = list(particle.neighbor_list[lattice_index])
             symbols = np.array([particle.get_symbol(index) for index in neighbors])
-            cartesian_coordinates = particle.atoms.get_positions(neighbors)
+            # float32 is ample here: the atomic broadening is far above fp32 epsilon
+            cartesian_coordinates = particle.atoms.get_positions(neighbors, dtype=np.float32)
 
-            center_atom_position = particle.atoms.get_positions([lattice_index])[0]
+            center_atom_position = particle.atoms.get_positions([lattice_index],
+                                                                dtype=np.float32)[0]
             cartesian_coordinates = list(map(lambda x: x - center_atom_position,
                                              cartesian_coordinates))
 
@@ -1,13 +1,33 @@
+import atexit
 import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 
 def setup_logging():
+    """Configure package-wide logging.
+
+    The level defaults to INFO and can be overridden through the NPL_LOG_LEVEL
+    environment variable. The actual handlers (file + stream) sit behind a
+    QueueListener so that record formatting and file I/O happen on a background
+    thread instead of blocking hot Monte Carlo loops; the log file is opened
+    lazily on the first record.
+    """
+    level = os.environ.get('NPL_LOG_LEVEL', 'INFO').upper()
+
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue,
+                             logging.FileHandler("npl.log", delay=True),
+                             logging.StreamHandler(),
+                             respect_handler_level=True)
+
     logging.basicConfig(
-        level=logging.INFO,
+        level=level,
         # format='%(name)s - %(levelname)s - %(message)s',
         format='%(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler("npl.log"),
-            logging.StreamHandler()
-        ]
+        handlers=[QueueHandler(log_queue)]
     )
+
+    listener.start()
+    atexit.register(listener.stop)
@@ -189,19 +189,19 @@ class GrandCanonicalEnsemble(BaseEnsemble):
             db_term = (self.volume / ((self.n_atoms+1)*lambda_db**3))
             exp_term = np.exp(-self._beta * (potential_diff - self._mu[species]))
             p = db_term * exp_term
-            logger.debug(f"Lambda_db: {lambda_db:.3e}, p: {p:.3e}, Beta: {self._beta:.3e}, "
-                         f"Exp: {exp_term:.3e}, Exp Arg {potential_diff - self._mu[species]}, "
-                         f"Potential diff: {potential_diff:.3e}, "
-                         f"Delta_particles: {delta_particles}")
+            logger.debug("Lambda_db: %.3e, p: %.3e, Beta: %.3e, Exp: %.3e, Exp Arg %s, "
+                         "Potential diff: %.3e, Delta_particles: %s",
+                         lambda_db, p, self._beta, exp_term,
+                         potential_diff - self._mu[species], potential_diff, delta_particles)
 
         elif delta_particles == -1:  # Deletion move
             db_term = (lambda_db**3*self.n_atoms / self.volume)
             exp_term = np.exp(-self._beta * (potential_diff + self._mu[species]))
             p = db_term * exp_term
-            logger.debug(f"Lambda_db: {lambda_db:.3e}, p: {p:.3e}, Beta: {self._beta:.3e}, "
-                         f"Exp: {exp_term:.3e}, Exp Arg {potential_diff - self._mu[species]}, "
-                         f"Potential diff: {potential_diff:.3e}, "
-                         f"Delta_particles: {delta_particles}")
+            logger.debug("Lambda_db: %.3e, p: %.3e, Beta: %.3e, Exp: %.3e, Exp Arg %s, "
+                         "Potential diff: %.3e, Delta_particles: %s",
+                         lambda_db, p, self._beta, exp_term,
+                         potential_diff - self._mu[species], potential_diff, delta_particles)
         if p > 1:
             return True
         else:
@@ -209,34 +209,37 @@ class GrandCanonicalEnsemble(BaseEnsemble):
 
     def do_displ_move(self):
         self.count_moves['Displacements'] += 1
-        return self.displace_move.do_trial_move(self.atoms)
+        return self.displace_move.do_trial_move(self.atoms), self.displace_move
 
     def do_ins_del_move(self):
         r2 = self.rng_move_choice.get_uniform()
         if r2 <= 0.5:
             self.count_moves['Insertions'] += 1
-            return self.insert_move.do_trial_move(self.atoms)
+            move = self.insert_move
         else:
             self.count_moves['Deletions'] += 1
-            return self.deletion_move.do_trial_move(self.atoms)
+            move = self.deletion_move
+        return move.do_trial_move(self.atoms), move
 
     def do_trial_step(self, ):
-        for move in range(self.n_moves):
+        for _ in range(self.n_moves):
             r1 = self.rng_move_choice.get_uniform()
             if r1 <= self.frac_ins_del:
-                atoms_new, delta_particles, species = self.do_ins_del_move()
+                (atoms_new, delta_particles, species, token), move = self.do_ins_del_move()
             else:
-                atoms_new = self.do_displ_move()
+                (atoms_new, token), move = self.do_displ_move()
                 delta_particles = 0
                 species = 'X'
 
-            if not atoms_new:  # NOTE: be carful here
+            if atoms_new is False:  # deletion with no atoms of the species
                 continue
 
+            # the moves mutate self.atoms in place; a rejected trial is rolled
+            # back with the move's undo token instead of discarding a copy
             E_new = self.compute_energy(atoms_new)
             delta_E = E_new - self.E_old
-            if self._acceptance_condition(atoms_new, delta_E, delta_particles, species):
-                self.atoms = atoms_new
+            accepted = self._acceptance_condition(atoms_new, delta_E, delta_particles, species)
+            if accepted:
                 self.n_atoms = len(self.atoms)
                 self.E_old = E_new
                 if delta_particles == 0:
@@ -245,6 +248,12 @@ class GrandCanonicalEnsemble(BaseEnsemble):
                     self.count_acceptance['Insertions'] += 1
                 if delta_particles == -1:
                     self.count_acceptance['Deletions'] += 1
+            else:
+                move.undo(self.atoms, token)
+
+            if delta_particles == 0:
+                # feed the outcome back so the move can adapt its step size
+                move.update_acceptance(accepted)
 
     def compute_energy(self, atoms):
         return self._calculator.get_potential_energy(atoms)
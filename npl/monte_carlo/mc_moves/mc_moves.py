@@ -1,9 +1,14 @@
 from abc import ABC, abstractmethod
-from ase import Atoms
+from ase import Atom, Atoms
+from ase.data import atomic_numbers, chemical_symbols
 from npl.utils import RandomNumberGenerator
+import logging
+import math
 import numpy as np
 from ase.geometry import wrap_positions
 
+logger = logging.getLogger(__name__)
+
 
 class BaseMove(ABC):
     """Abstract base class for Monte Carlo moves."""
@@ -23,10 +28,19 @@ class BaseMove(ABC):
     @abstractmethod
     def do_trial_move(self, atoms) -> Atoms:
         """
-        Perform the Monte Carlo move and return the new atomic configuration.
+        Perform the Monte Carlo move in place and return the configuration
+        together with an undo token.
 
         Returns:
-        Atoms: Updated ASE Atoms object after the move.
+        Atoms: The same ASE Atoms object, mutated by the move.
+        """
+        pass
+
+    @abstractmethod
+    def undo(self, atoms, token) -> None:
+        """
+        Roll back a trial move applied in place, using the token returned by
+        do_trial_move.
         """
         pass
 
@@ -40,24 +54,34 @@ class InsertionMove(BaseMove):
                  z_shift : float = None):
         super().__init__(species, seed)
         self.box = operating_box
+        self._box_matrix = None if operating_box is None else np.asarray(operating_box,
+                                                                         dtype=float)
         self.z_shift = z_shift
 
     def do_trial_move(self, atoms) -> Atoms:
         """
         Insert a random atom of a random species at a random position.
 
+        The atom is appended in place; rejecting the trial is undone by
+        removing the last atom again.
+
         Returns:
-        Atoms: Updated ASE Atoms object after the insertion.
+        (Atoms, int, str, tuple): The mutated atoms, the particle count change,
+        the species and the undo token.
         """
-        atoms_new = atoms.copy()
-        selected_species = self.rng.random.choice(self.species)
-        position = np.array([
-            self.box[i]*self.rng.get_uniform() for i in range(3)
-            ]).sum(axis=0)
+        selected_species = self.species[self.rng.random.randrange(len(self.species))]
+        # one vector draw and one matvec of the fractional coordinates
+        # instead of three scalar draws and summed scaled box vectors
+        frac = self.rng.uniform_vec(3)
+        position = frac @ self._box_matrix
         if self.z_shift:
             position[2] += self.z_shift
-        atoms_new += Atoms(selected_species, positions=[position])
-        return atoms_new, 1, selected_species
+        atoms += Atoms(selected_species, positions=[position])
+        return atoms, 1, selected_species, ('ins',)
+
+    def undo(self, atoms, token) -> None:
+        """Remove the atom appended by the last trial insertion."""
+        del atoms[-1]
 
 
 class DeletionMove(BaseMove):
@@ -75,26 +99,46 @@ class DeletionMove(BaseMove):
         """
         Delete a random atom from the structure.
 
+        The atom is removed in place; the undo token carries what is needed to
+        reinsert it at its original index on rejection.
+
         Returns:
-        Atoms: Updated ASE Atoms object after the deletion.
-        """
-        trials = True
-        atoms_new = atoms.copy()
-        selected_species = self.rng.random.choice(self.species)
-        indices_of_species = [atom.index for atom in atoms_new if atom.symbol in selected_species]
-        if len(indices_of_species) == 0:
-            return False, -1, 'X'
+        (Atoms, int, str, tuple): The mutated atoms, the particle count change,
+        the species and the undo token.
+        """
+        selected_species = self.species[self.rng.random.randrange(len(self.species))]
+        # integer comparison on the atomic numbers instead of a Python loop
+        # comparing symbol strings atom by atom
+        indices_of_species = np.flatnonzero(atoms.numbers == atomic_numbers[selected_species])
+        if indices_of_species.size == 0:
+            return False, -1, 'X', None
+        # direct index draws; Random.choice would pay a generic __getitem__
+        # dispatch per call on the ndarray
         if not self.z_shift:
-            remove_index = self.rng.random.choice(indices_of_species)
-            del atoms_new[remove_index]
-            return atoms_new, -1, selected_species
-        while trials:
-            remove_index = self.rng.random.choice(indices_of_species)
-            position = atoms_new[remove_index].position - np.array([0, 0, self.z_shift])
-            if position[2] >= 0 and position[2] <= self.box[2][2]:
-                trials = False
-        del atoms_new[remove_index]
-        return atoms_new, -1, selected_species
+            remove_index = int(indices_of_species[
+                self.rng.random.randrange(indices_of_species.size)])
+        else:
+            trials = True
+            while trials:
+                remove_index = int(indices_of_species[
+                    self.rng.random.randrange(indices_of_species.size)])
+                position = atoms.positions[remove_index] - np.array([0, 0, self.z_shift])
+                if position[2] >= 0 and position[2] <= self.box[2][2]:
+                    trials = False
+        token = ('del', remove_index, int(atoms.numbers[remove_index]),
+                 atoms.positions[remove_index].copy())
+        del atoms[remove_index]
+        return atoms, -1, selected_species, token
+
+    def undo(self, atoms, token) -> None:
+        """Reinsert the atom removed by the last trial deletion at its old index."""
+        _, index, number, position = token
+        atoms.append(Atom(chemical_symbols[number], position))
+        if index != len(atoms) - 1:
+            # rotate the appended atom back into place so the original atom
+            # ordering (and any index-based constraints) is preserved
+            for array in atoms.arrays.values():
+                array[index:] = np.roll(array[index:], 1, axis=0)
 
 
 class DisplacementMove(BaseMove):
@@ -114,26 +158,82 @@ class DisplacementMove(BaseMove):
         """
         super().__init__(species, seed)
         self.max_displacement = max_displacement
+        # online step-size adaptation towards a healthy Metropolis acceptance
+        # rate; a fixed max_displacement easily mixes at ~0% or ~100%
+        self._n_trial = 0
+        self._n_accept = 0
+        self._target = 0.4
+        self._adapt_interval = 100
         if len(constraints) > 0:
             self.constraints = constraints[0].todict()['kwargs']['indices']
         else:
             self.constraints = []
+        # cached cell matrix and inverse for the single-atom wrap; the cell
+        # rarely changes between moves
+        self._cell_key = None
+        self._cell_matrix = None
+        self._cell_inv = None
+
+    def update_acceptance(self, accepted: bool) -> None:
+        """
+        Record the outcome of a trial displacement and adapt max_displacement.
+
+        Every _adapt_interval trials the step size is rescaled towards the
+        target acceptance rate (Robbins-Monro style): too many acceptances grow
+        the step, too few shrink it.
+        """
+        self._n_trial += 1
+        if accepted:
+            self._n_accept += 1
+        if self._n_trial == self._adapt_interval:
+            rate = self._n_accept / self._n_trial
+            self.max_displacement *= math.exp(0.2 * (rate - self._target))
+            logger.info("Displacement acceptance rate: {:.2f}, "
+                        "max_displacement -> {:.4f}".format(rate, self.max_displacement))
+            self._n_trial = 0
+            self._n_accept = 0
+
+    def _wrap_position(self, atoms, position):
+        """Wrap a single position into the cell with a 3x3 matvec.
+
+        wrap_positions would redo the fractional transform for all N atoms to
+        wrap the one that moved. Incomplete cells fall back to ase.
+        """
+        cell = atoms.cell
+        if cell.rank < 3:
+            return wrap_positions(position[np.newaxis, :], cell, pbc=atoms.pbc)[0]
+        key = cell[:].tobytes()
+        if key != self._cell_key:
+            self._cell_key = key
+            self._cell_matrix = np.array(cell)
+            self._cell_inv = np.linalg.inv(self._cell_matrix)
+        frac = position @ self._cell_inv
+        frac -= np.floor(frac)
+        return frac @ self._cell_matrix
 
     def do_trial_move(self, atoms) -> Atoms:
         """
         Displace a random atom by a random vector within the maximum displacement range.
 
+        The position is changed in place; the undo token holds the original
+        position so a rejected trial restores it exactly even after wrapping.
+
         Returns:
-        Atoms: Updated ASE Atoms object after the displacement.
+        (Atoms, tuple): The mutated atoms and the undo token.
         """
-        atoms_new = atoms.copy()
-        if len(atoms_new) == 0:
+        if len(atoms) == 0:
             raise ValueError("No atoms to displace.")
-        to_move = np.setdiff1d(np.arange(len(atoms_new)), self.constraints)
-        atom_index = self.rng.random.choice(to_move)
-        displacement = [
-            self.rng.get_uniform(-self.max_displacement, self.max_displacement) for _ in range(3)
-            ]
-        atoms_new.positions[atom_index] += displacement
-        atoms_new.set_positions(wrap_positions(atoms_new.positions, atoms_new.cell))
-        return atoms_new
+        to_move = np.setdiff1d(np.arange(len(atoms)), self.constraints)
+        atom_index = int(to_move[self.rng.random.randrange(to_move.size)])
+        displacement = self.rng.uniform_vec(3, -self.max_displacement, self.max_displacement)
+        token = ('disp', atom_index, atoms.positions[atom_index].copy())
+        new_position = atoms.positions[atom_index] + displacement
+        # only the displaced atom can have left the cell, so only its row is
+        # wrapped instead of all N positions
+        atoms.positions[atom_index] = self._wrap_position(atoms, new_position)
+        return atoms, token
+
+    def undo(self, atoms, token) -> None:
+        """Restore the position of the atom displaced by the last trial move."""
+        _, index, position = token
+        atoms.positions[index] = position
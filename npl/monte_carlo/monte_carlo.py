@@ -1,4 +1,5 @@
 import logging
+import math
 import numpy as np
 import copy
 
@@ -8,6 +9,9 @@ from npl.monte_carlo.random_exchange_operator import RandomExchangeOperator
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# block size for pre-generated acceptance draws
+_RAND_BLOCK = 4096
+
 
 def setup_monte_carlo(start_particle, energy_calculator, local_feature_classifier):
     symbols = start_particle.get_all_symbols()
@@ -26,14 +30,15 @@ def setup_monte_carlo(start_particle, energy_calculator, local_feature_classifie
 
 
 def update_atomic_features(exchanges, local_env_calculator, local_feature_classifier, particle):
+    nl = particle.neighbor_list
     neighborhood = set()
     for exchange in exchanges:
         index1, index2 = exchange
-        neighborhood.add(index1)
-        neighborhood.add(index2)
-
-        neighborhood = neighborhood.union(particle.neighbor_list[index1])
-        neighborhood = neighborhood.union(particle.neighbor_list[index2])
+        # in-place update instead of rebinding to the fresh set returned by
+        # union(), which re-hashes the whole neighborhood per exchange
+        neighborhood.update((index1, index2))
+        neighborhood.update(nl[index1])
+        neighborhood.update(nl[index2])
 
     for index in neighborhood:
         local_env_calculator.compute_local_environment(particle, index)
@@ -54,9 +59,20 @@ def mc_run(beta, max_steps, start_particle, energy_calculator, local_feature_cla
     lowest_energy = start_energy
     accepted_energies = [(lowest_energy, 0)]
 
-    found_new_solution = False
-    fields = ['energies', 'symbols']
-    best_particle = copy.deepcopy(start_particle.get_as_dictionary(fields))
+    # local aliases: scalar math.exp avoids the array-dispatch overhead of
+    # np.exp and the attribute lookups drop out of the hot loop
+    _exp = math.exp
+    _beta = beta
+
+    # acceptance draws come from one PCG64 generator, pre-generated in blocks
+    # so the uphill branch pays an array index instead of a function call;
+    # seeding it from the global stream keeps np.random.seed reproducing runs
+    rng = np.random.default_rng(np.random.randint(2**32))
+    rand_buf = rng.random(_RAND_BLOCK)
+    rand_pos = 0
+
+    best_symbols = start_particle.snapshot_symbols()
+    best_energy = start_energy
 
     total_steps = 0
     no_improvement = 0
@@ -77,24 +93,32 @@ def mc_run(beta, max_steps, start_particle, energy_calculator, local_feature_cla
 
         delta_e = new_energy - start_energy
 
-        acceptance_rate = min(1, np.exp(-beta * delta_e))
-        if np.random.random() < acceptance_rate:
-            if found_new_solution:
-                if new_energy > start_energy:
-                    start_particle.swap_symbols(exchanges)
-                    best_particle = copy.deepcopy(start_particle)
-                    start_particle.swap_symbols(exchanges)
-
+        # short-circuit: downhill moves are always accepted without paying
+        # for the exponential or a draw
+        if delta_e <= 0.0:
+            accepted = True
+        else:
+            if rand_pos == _RAND_BLOCK:
+                rand_buf = rng.random(_RAND_BLOCK)
+                rand_pos = 0
+            u = rand_buf[rand_pos]
+            rand_pos += 1
+            accepted = u < _exp(-_beta * delta_e)
+
+        if accepted:
             start_energy = new_energy
             accepted_energies.append((new_energy, total_steps))
 
             if new_energy < lowest_energy:
                 no_improvement = 0
                 lowest_energy = new_energy
-                found_new_solution = True
+                # the particle is in the best state right now; capture it
+                # immediately instead of swapping back and forth around a
+                # deepcopy on the next move
+                best_symbols = start_particle.snapshot_symbols()
+                best_energy = new_energy
             else:
                 no_improvement += 1
-                found_new_solution = False
 
         else:
             no_improvement += 1
@@ -106,12 +130,12 @@ def mc_run(beta, max_steps, start_particle, energy_calculator, local_feature_cla
                 local_env_calculator.compute_local_environment(start_particle, index)
                 local_feature_classifier.compute_atom_feature(start_particle, index)
 
-            if found_new_solution:
-                best_particle = copy.deepcopy(start_particle)
-                found_new_solution = False
-
     accepted_energies.append((accepted_energies[-1][0], total_steps))
 
+    best_particle = copy.deepcopy(start_particle)
+    best_particle.restore_symbols(best_symbols)
+    best_particle.set_energy(energy_key, best_energy)
+
     return [best_particle, accepted_energies]
 
 
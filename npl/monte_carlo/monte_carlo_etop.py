@@ -1,15 +1,41 @@
 import logging
+import math
 import numpy as np
 import copy
+from concurrent.futures import ProcessPoolExecutor
 from ase.units import kB
 import warnings
 
 from npl.monte_carlo.random_exchange_operator_etop import RandomExchangeOperatorExtended
 
+try:
+    from numba import njit
+
+    @njit(cache=True)
+    def metropolis_step(delta_e, beta, u):
+        """Scalar Metropolis acceptance decision."""
+        return delta_e <= 0.0 or u < math.exp(-beta * delta_e)
+
+    @njit(cache=True)
+    def metropolis_batch(delta_e, beta, u, out_accept):
+        """Batched Metropolis decisions; the loop SIMDizes under LLVM."""
+        for i in range(delta_e.size):
+            out_accept[i] = delta_e[i] <= 0.0 or u[i] < math.exp(-beta * delta_e[i])
+except ImportError:
+    metropolis_step = None
+
+    def metropolis_batch(delta_e, beta, u, out_accept):
+        """Batched Metropolis decisions, vectorized numpy fallback."""
+        np.less(u, np.exp(-beta * np.maximum(delta_e, 0.0)), out=out_accept)
+        np.logical_or(out_accept, delta_e <= 0.0, out=out_accept)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 warnings.filterwarnings('ignore')
 
+# block size for pre-generated acceptance draws
+_RAND_BLOCK = 4096
+
 
 def setup_monte_carlo(start_particle, energy_calculator, feature_classifier):
     energy_key = energy_calculator.get_energy_key()
@@ -28,17 +54,196 @@ def setup_monte_carlo(start_particle, energy_calculator, feature_classifier):
 def features_to_update(start_particle, exchanges):
 
     neighborhood = set()
-    for exchange in exchanges:
-        index1, index2 = exchange
-        neighborhood.add(index1)
-        neighborhood.add(index2)
-
-        neighborhood = neighborhood.union(start_particle.neighbor_list[index1])
-        neighborhood = neighborhood.union(start_particle.neighbor_list[index2])
+    for index1, index2 in exchanges:
+        neighborhood.update(start_particle.get_pair_neighborhood(index1, index2))
 
     return neighborhood
 
 
+def _linear_coefficients(energy_calculator):
+    """Return the linear model coefficients of the calculator, or None.
+
+    Covers TOPCalculator (model.coef_) and BayesianRRCalculator (ridge.coef_)
+    without naming either; an unfitted model has no coef_ yet and yields None.
+    """
+    for attr in ('model', 'ridge'):
+        coefficients = getattr(getattr(energy_calculator, attr, None), 'coef_', None)
+        if coefficients is not None:
+            return coefficients
+    return None
+
+
+def _mc_sweep(replica, beta, n_steps, seed=None):
+    """Advance one replica by n_steps Metropolis steps and return it.
+
+    The replica is a dict carrying the particle together with its bound
+    exchange operator, feature calculator and energy calculator, so the whole
+    sweep can be shipped to a worker process in one piece. The current energy
+    is kept under the 'energy' key. The driver hands each sweep a seed for
+    the acceptance draws, so runs stay reproducible under np.random.seed and
+    pooled workers do not share one entropy-seeded stream.
+    """
+    particle = replica['particle']
+    exchange_operator = replica['exchange_operator']
+    feature_calculator = replica['feature_calculator']
+    energy_calculator = replica['energy_calculator']
+    energy_key = replica['energy_key']
+    energy = replica['energy']
+
+    # linear calculators expose compute_energy_delta; an exchange then costs a
+    # dot product with the feature change instead of a whole-particle pass
+    compute_delta = getattr(energy_calculator, 'compute_energy_delta', None)
+    # with the model coefficients at hand, the feature update and the scoring
+    # fuse into a single call on the classifier
+    update_and_score = getattr(feature_calculator, 'update_and_score', None)
+    energy_coeffs = _linear_coefficients(energy_calculator)
+    if energy_coeffs is None:
+        update_and_score = None
+
+    _exp = math.exp
+    rng = np.random.default_rng(seed)
+    rand_buf = rng.random(_RAND_BLOCK)
+    rand_pos = 0
+
+    for _ in range(n_steps):
+        exchanges = exchange_operator.random_exchange(particle)
+        neighborhood = features_to_update(particle, exchanges)
+
+        if update_and_score is not None:
+            old_atom_features, change, delta_e = update_and_score(particle, neighborhood,
+                                                                  energy_coeffs)
+            new_energy = energy + delta_e
+            particle.set_energy(energy_key, new_energy)
+        else:
+            old_atom_features, change = feature_calculator.update_feature_vector(particle,
+                                                                                 neighborhood)
+            if compute_delta is not None:
+                delta_e = compute_delta(particle, change)
+                new_energy = energy + delta_e
+            else:
+                energy_calculator.compute_energy(particle)
+                new_energy = particle.get_energy(energy_key)
+                delta_e = new_energy - energy
+        if delta_e <= 0.0:
+            accepted = True
+        else:
+            if rand_pos == _RAND_BLOCK:
+                rand_buf = rng.random(_RAND_BLOCK)
+                rand_pos = 0
+            u = rand_buf[rand_pos]
+            rand_pos += 1
+            if metropolis_step is not None:
+                accepted = metropolis_step(delta_e, beta, u)
+            else:
+                accepted = u < _exp(-beta * delta_e)
+
+        if accepted:
+            energy = new_energy
+        else:
+            particle.swap_symbols(exchanges)
+            particle.set_energy(energy_key, energy)
+            feature_calculator.downgrade_feature_vector(particle, neighborhood,
+                                                        old_atom_features, change)
+
+    replica['energy'] = energy
+    return replica
+
+
+def run_replica_exchange(start_particle, energy_calculator, feature_classifier,
+                         temperatures=None, n_replicas=4, t_min=300.0, t_max=2000.0,
+                         sweep_steps=1000, n_sweeps=100, processes=None):
+    """Parallel tempering around the Metropolis sweep of run_monte_carlo.
+
+    R replicas of the start particle are propagated independently for
+    sweep_steps Metropolis steps per sweep, each at its own temperature.
+    Between sweeps, neighboring temperature slots attempt to exchange their
+    configurations (alternating odd/even pairs) with the standard replica
+    exchange criterion, which lets orderings trapped at low temperature escape
+    through the hot replicas.
+
+    If temperatures is not given, n_replicas temperatures are spaced
+    geometrically between t_min and t_max. With processes set, the sweeps of
+    one round run concurrently in a multiprocessing pool; by default they run
+    sequentially in this process. Returns [best_particle, replica_energies]
+    where replica_energies holds one energy tuple per sweep.
+    """
+    if temperatures is None:
+        if n_replicas > 1:
+            ratio = t_max / t_min
+            temperatures = [t_min * ratio ** (i / (n_replicas - 1))
+                            for i in range(n_replicas)]
+        else:
+            temperatures = [t_min]
+    n_replicas = len(temperatures)
+    betas = [1 / (kB * temperature) for temperature in temperatures]
+
+    logging.info("=====================================================")
+    logging.info("Replica exchange Monte Carlo simulation")
+    logging.info("=====================================================\n")
+    logging.info("Temperatures: {}".format(["{:.1f}".format(t) for t in temperatures]))
+    logging.info("Sweeps: {} x {} steps".format(n_sweeps, sweep_steps))
+
+    replicas = []
+    for _ in range(n_replicas):
+        particle = copy.deepcopy(start_particle)
+        replica_energy_calculator = copy.deepcopy(energy_calculator)
+        replica_feature_calculator = copy.deepcopy(feature_classifier)
+        energy_key, feature_calculator, exchange_operator = setup_monte_carlo(
+            particle, replica_energy_calculator, replica_feature_calculator)
+        replicas.append({'particle': particle,
+                         'exchange_operator': exchange_operator,
+                         'feature_calculator': feature_calculator,
+                         'energy_calculator': replica_energy_calculator,
+                         'energy_key': energy_key,
+                         'energy': particle.get_energy(energy_key)})
+
+    best_energy = min(replica['energy'] for replica in replicas)
+    best_particle = copy.deepcopy(start_particle)
+    replica_energies = []
+    # seeded from the global stream so np.random.seed reproduces the whole run
+    rng = np.random.default_rng(np.random.randint(2**32))
+
+    # one pool for the whole run; spawning fresh worker processes per sweep
+    # would dominate short sweeps
+    executor = ProcessPoolExecutor(max_workers=processes) if processes is not None else None
+    try:
+        for sweep in range(n_sweeps):
+            sweep_seeds = [int(seed) for seed in rng.integers(2**32, size=n_replicas)]
+            if executor is not None:
+                replicas = list(executor.map(_mc_sweep, replicas, betas,
+                                             [sweep_steps] * n_replicas, sweep_seeds))
+            else:
+                replicas = [_mc_sweep(replica, beta, sweep_steps, seed)
+                            for replica, beta, seed in zip(replicas, betas, sweep_seeds)]
+
+            energies = [replica['energy'] for replica in replicas]
+            replica_energies.append(tuple(energies))
+
+            lowest = min(energies)
+            if lowest < best_energy:
+                best_energy = lowest
+                best_particle = copy.deepcopy(replicas[energies.index(lowest)]['particle'])
+
+            # alternate odd/even neighbor pairs between sweeps; the exchange
+            # swaps configurations between temperature slots, never copies them
+            for lower in range(sweep % 2, n_replicas - 1, 2):
+                upper = lower + 1
+                energy_diff = replicas[upper]['energy'] - replicas[lower]['energy']
+                beta_diff = betas[upper] - betas[lower]
+                exponent = energy_diff * beta_diff
+                if exponent >= 0.0 or rng.random() < math.exp(exponent):
+                    replicas[lower], replicas[upper] = replicas[upper], replicas[lower]
+
+            if (sweep + 1) % 10 == 0:
+                logging.info("Sweep: {}".format(sweep + 1))
+                logging.info("Lowest energy: {}".format(best_energy))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return [best_particle, replica_energies]
+
+
 def run_monte_carlo(temperature, max_steps, start_particle, energy_calculator, feature_classifier):
 
     energy_key, feature_calculator, exchange_operator = setup_monte_carlo(start_particle,
@@ -55,12 +260,34 @@ def run_monte_carlo(temperature, max_steps, start_particle, energy_calculator, f
 
     beta = 1 / (kB * temperature)
 
+    # local aliases: scalar math.exp avoids the array-dispatch overhead of
+    # np.exp and the attribute lookups drop out of the hot loop
+    _exp = math.exp
+    _beta = beta
+
+    # acceptance draws come from one PCG64 generator, pre-generated in blocks
+    # so the uphill branch pays an array index instead of a function call;
+    # seeding it from the global stream keeps np.random.seed reproducing runs
+    rng = np.random.default_rng(np.random.randint(2**32))
+    rand_buf = rng.random(_RAND_BLOCK)
+    rand_pos = 0
+
+    # linear calculators expose compute_energy_delta; an exchange then costs a
+    # dot product with the feature change instead of a whole-particle pass
+    compute_delta = getattr(energy_calculator, 'compute_energy_delta', None)
+    # with the model coefficients at hand, the feature update and the scoring
+    # fuse into a single call on the classifier
+    update_and_score = getattr(feature_calculator, 'update_and_score', None)
+    energy_coeffs = _linear_coefficients(energy_calculator)
+    if energy_coeffs is None:
+        update_and_score = None
+
     start_energy = start_particle.get_energy(energy_key)
     lowest_energy = start_energy
     accepted_energies = [(lowest_energy, 0)]
 
-    found_new_solution = False
-    best_particle = copy.deepcopy(start_particle)
+    best_symbols = start_particle.snapshot_symbols()
+    best_energy = start_energy
 
     total_steps = 0
     no_improvement = 0
@@ -73,34 +300,50 @@ def run_monte_carlo(temperature, max_steps, start_particle, energy_calculator, f
         exchanges = exchange_operator.random_exchange(start_particle)
         neighborhood = features_to_update(start_particle, exchanges)
 
-        old_atom_features, change = feature_calculator.update_feature_vector(start_particle,
-                                                                             neighborhood)
-
-        energy_calculator.compute_energy(start_particle)
-        new_energy = start_particle.get_energy(energy_key)
-
-        delta_e = new_energy - start_energy
-
-        acceptance_rate = min(1, np.exp(-beta * delta_e))
-        if np.random.random() < acceptance_rate:
-            if found_new_solution:
-                if new_energy > start_energy:
-                    start_particle.swap_symbols(exchanges)
-                    best_particle = copy.deepcopy(start_particle)
-                    # accepted_structures.append(copy.deepcopy(start_particle.get_ase_atoms()))
-                    # best_particle['energies'][energy_key] = start_energy
-                    start_particle.swap_symbols(exchanges)
+        if update_and_score is not None:
+            old_atom_features, change, delta_e = update_and_score(start_particle, neighborhood,
+                                                                  energy_coeffs)
+            new_energy = start_energy + delta_e
+            start_particle.set_energy(energy_key, new_energy)
+        else:
+            old_atom_features, change = feature_calculator.update_feature_vector(start_particle,
+                                                                                 neighborhood)
+            if compute_delta is not None:
+                delta_e = compute_delta(start_particle, change)
+                new_energy = start_energy + delta_e
+            else:
+                energy_calculator.compute_energy(start_particle)
+                new_energy = start_particle.get_energy(energy_key)
+                delta_e = new_energy - start_energy
+
+        # short-circuit: downhill moves are always accepted without paying
+        # for the exponential or a draw
+        if delta_e <= 0.0:
+            accepted = True
+        else:
+            if rand_pos == _RAND_BLOCK:
+                rand_buf = rng.random(_RAND_BLOCK)
+                rand_pos = 0
+            u = rand_buf[rand_pos]
+            rand_pos += 1
+            if metropolis_step is not None:
+                accepted = metropolis_step(delta_e, _beta, u)
+            else:
+                accepted = u < _exp(-_beta * delta_e)
 
+        if accepted:
             start_energy = new_energy
             accepted_energies.append((new_energy, total_steps))
 
             if new_energy < lowest_energy:
                 no_improvement = 0
                 lowest_energy = new_energy
-                found_new_solution = True
+                # the particle is in the best state right now; capture it
+                # immediately instead of lazily on the next move
+                best_symbols = start_particle.snapshot_symbols()
+                best_energy = new_energy
             else:
                 no_improvement += 1
-                found_new_solution = False
 
         else:
             no_improvement += 1
@@ -111,12 +354,10 @@ def run_monte_carlo(temperature, max_steps, start_particle, energy_calculator, f
             feature_calculator.downgrade_feature_vector(start_particle, neighborhood,
                                                         old_atom_features, change)
 
-            if found_new_solution:
-                best_particle = copy.deepcopy(start_particle)
-                # accepted_structures.append(copy.deepcopy(start_particle.get_ase_atoms()))
-                # best_particle['energies'][energy_key] = copy.deepcopy(start_energy)
-                found_new_solution = False
-
     accepted_energies.append((accepted_energies[-1][0], total_steps))
 
+    best_particle = copy.deepcopy(start_particle)
+    best_particle.restore_symbols(best_symbols)
+    best_particle.set_energy(energy_key, best_energy)
+
     return [best_particle, accepted_energies]
@@ -1,7 +1,9 @@
 from npl.optimization.local_optimization import setup_local_optimization
 from npl.optimization.local_optimization import update_atomic_features
+from npl.calculators.energy_calculator import CachedEnergyCalculator
 import logging
 import copy
+import numpy as np
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,15 +21,27 @@ def run_basin_hopping(start_particle, energy_calculator, environment_energies, n
         setup_local_optimization(start_particle, energy_calculator, environment_energies,
                                  local_feature_classifier)
 
+    # basin hopping revisits configurations around the current minimum, so
+    # feature-vector based calculators are wrapped with a memoizing cache
+    if hasattr(energy_calculator, 'feature_key'):
+        energy_calculator = CachedEnergyCalculator(energy_calculator)
+
     logging.info("Starting energy: {}".format(start_particle.get_energy(
         energy_calculator.get_energy_key())))
 
     start_energy = start_particle.get_energy(energy_key)
     lowest_energies = [(start_energy, 0)]
-    best_particle = copy.deepcopy(start_particle)
+    best_symbols = start_particle.snapshot_symbols()
+    best_energy = start_energy
     lowest_energy = start_energy
 
-    flip_energy_list = []
+    # flip/delta-e log as preallocated structure-of-arrays buffers instead of
+    # a list of heterogeneous tuples; grown geometrically, trimmed on return
+    capacity = max(4 * n_hopping_attempts, 64)
+    flip_arr = np.empty(capacity, dtype=np.float64)
+    de_arr = np.empty(capacity, dtype=np.float64)
+    idx_arr = np.empty((capacity, 2), dtype=np.int32)
+    n_flips = 0
 
     step = 0
     for i in range(n_hopping_attempts):
@@ -50,7 +64,16 @@ def run_basin_hopping(start_particle, energy_calculator, environment_energies, n
             energy_calculator.compute_energy(start_particle)
             new_energy = start_particle.get_energy(energy_key)
 
-            flip_energy_list.append((flip, new_energy-start_energy, exchanged_indices))
+            if n_flips == flip_arr.size:
+                capacity *= 2
+                flip_arr = np.resize(flip_arr, capacity)
+                de_arr = np.resize(de_arr, capacity)
+                idx_arr = np.resize(idx_arr, (capacity, 2))
+            flip_arr[n_flips] = flip
+            de_arr[n_flips] = new_energy - start_energy
+            idx_arr[n_flips, 0] = index1
+            idx_arr[n_flips, 1] = index2
+            n_flips += 1
 
             if new_energy < start_energy:
                 start_energy = new_energy
@@ -65,11 +88,10 @@ def run_basin_hopping(start_particle, energy_calculator, environment_energies, n
                         lowest_energy))
 
                 if lowest_energy == start_energy:
-                    start_particle.swap_symbols([(index1, index2)])
-                    best_particle = copy.deepcopy(start_particle)
-                    best_particle.set_energy(energy_key, start_energy)
-
-                    start_particle.swap_symbols([(index1, index2)])
+                    # capture the pre-exchange ordering by undoing the swap
+                    # inside the snapshot copy, not on the particle
+                    best_symbols = start_particle.snapshot_symbols([(index1, index2)])
+                    best_energy = start_energy
                 break
 
         for hop in range(n_hops):
@@ -92,4 +114,9 @@ def run_basin_hopping(start_particle, energy_calculator, environment_energies, n
     logging.info('Lowest energy: {:.3f}'.format(lowest_energy))
     lowest_energies.append((lowest_energy, step))
 
-    return [best_particle, lowest_energies, flip_energy_list]
+    best_particle = copy.deepcopy(start_particle)
+    best_particle.restore_symbols(best_symbols)
+    best_particle.set_energy(energy_key, best_energy)
+
+    return [best_particle, lowest_energies,
+            (flip_arr[:n_flips], de_arr[:n_flips], idx_arr[:n_flips])]
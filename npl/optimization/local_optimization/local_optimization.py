@@ -26,12 +26,15 @@ def setup_local_optimization(start_particle, energy_calculator, environment_ener
 
 def update_atomic_features(index1, index2, local_env_calculator, local_feature_classifier,
                            particle):
+    nl = particle.neighbor_list
     neighborhood = {index1, index2}
-    neighborhood = neighborhood.union(particle.neighbor_list[index1])
-    neighborhood = neighborhood.union(particle.neighbor_list[index2])
+    neighborhood.update(nl[index1])
+    neighborhood.update(nl[index2])
 
-    for x in neighborhood:
-        neighborhood = neighborhood.union(particle.neighbor_list[x])
+    # expand by the second shell in place; the snapshot keeps the iteration
+    # over the first shell only, as the rebinding version did implicitly
+    for x in tuple(neighborhood):
+        neighborhood.update(nl[x])
 
     for index in neighborhood:
         local_env_calculator.compute_local_environment(particle, index)
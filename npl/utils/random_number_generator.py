@@ -1,5 +1,7 @@
 from random import Random
 
+import numpy as np
+
 
 class RandomNumberGenerator:
     """Class for generating random numbers with optional seeding."""
@@ -12,6 +14,9 @@ class RandomNumberGenerator:
         seed (int, optional): Seed for reproducibility. Default is None.
         """
         self.random = Random(seed)
+        # separate seeded PCG64 stream for vector draws; one C call replaces
+        # n Python-level scalar dispatches
+        self._np_random = np.random.default_rng(seed)
 
         if warm_up:
             for _ in range(warm_up):
@@ -31,6 +36,25 @@ class RandomNumberGenerator:
         """
         return self.random.uniform(a, b)
 
+    def uniform_vec(self, n, low=0.0, high=1.0) -> np.ndarray:
+        """
+        Generate n random numbers uniformly distributed between low and high.
+
+        Drawn from the PCG64 stream in a single call, so vector-valued moves
+        (e.g. a 3d displacement) avoid one Python dispatch per component.
+
+        Parameters:
+        n (int): Number of draws.
+        low (float): Lower bound.
+        high (float): Upper bound.
+
+        Returns:
+        np.ndarray: Array of n random numbers.
+        """
+        if low == 0.0 and high == 1.0:
+            return self._np_random.random(n)
+        return self._np_random.uniform(low, high, size=n)
+
     def get_gaussian(self, mu=0.0, sigma=1.0) -> float:
         """
         Generate a random number with a Gaussian distribution.